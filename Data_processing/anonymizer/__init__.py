@@ -1,3 +1,5 @@
 # anonymizer/__init__.py
-from anonymizer.anonymizer import Anonymizer
-from anonymizer.generator import MockDataGenerator
\ No newline at end of file
+from anonymizer.anonymizer import Anonymizer, AnonymizationStats
+from anonymizer.generator import MockDataGenerator
+from anonymizer.pseudonymizer import Pseudonymizer
+from anonymizer.rules import AnonymizationRules, CompiledRules
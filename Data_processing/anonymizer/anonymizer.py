@@ -1,36 +1,100 @@
 import csv
-import random
-import string
-from typing import Dict, List
+import dataclasses
+import time
+from itertools import islice
+from typing import Callable, Iterator, List, Optional
 from pathlib import Path
 import logging
+from anonymizer.pseudonymizer import Pseudonymizer
+from anonymizer.rules import AnonymizationRules, CompiledRules
+from anonymizer.seeding import python_random, root_seed_sequence
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+@dataclasses.dataclass
+class AnonymizationStats:
+    """
+    Progress and throughput of an anonymization run.
+
+    Attributes:
+        rows (int): The number of rows written so far.
+        batches (int): The number of batches written so far.
+        seconds (float): The time elapsed since the run started.
+    """
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
 class Anonymizer:
     """
     Anonymizes specified fields in a CSV file and writes the result to another CSV file.
 
+    The file is streamed in batches of `batch_size` rows, so memory use does not
+    grow with the size of the input. The rules are compiled once against the
+    header into a function per column position, which is applied to every row.
+
     Attributes:
         input_file (Path): The path to the input CSV file.
         output_file (Path): The path to the output CSV file.
         fields_to_anonymize (List[str]): The list of fields to be anonymized.
+        batch_size (int): The number of rows read, anonymized and written at a time.
+        progress_callback (Optional[Callable[[AnonymizationStats], None]]): Called after every batch.
+        pseudonymizer (Optional[Pseudonymizer]): Replaces values with deterministic keyed
+            pseudonyms instead of random ones when set.
+        rules (AnonymizationRules): The strategy of every column; built from
+            `fields_to_anonymize` and `pseudonymizer` unless given.
+        seed (Optional[int]): Seeds the random strategies, so a run can be reproduced.
     """
 
-    def __init__(self, input_file: Path, output_file: Path, fields_to_anonymize: List[str]):
+    def __init__(self, input_file: Path, output_file: Path, fields_to_anonymize: List[str],
+                 batch_size: int = 10000,
+                 progress_callback: Optional[Callable[[AnonymizationStats], None]] = None,
+                 pseudonymizer: Optional[Pseudonymizer] = None,
+                 rules: Optional[AnonymizationRules] = None, seed: Optional[int] = None):
         self.input_file = input_file
         self.output_file = output_file
         self.fields_to_anonymize = fields_to_anonymize
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        self.pseudonymizer = pseudonymizer
+        self.rules = rules or AnonymizationRules.from_fields(fields_to_anonymize, pseudonymizer)
+        self.seed = seed
 
-    def anonymize_data(self) -> None:
+    def anonymize_data(self) -> AnonymizationStats:
         """
         Anonymizes the data from the input file and writes it to the output file.
+
+        Returns:
+            AnonymizationStats: The number of rows and batches processed and the time taken.
         """
         try:
-            data = self._read_data()
-            anonymized_data = self._process_data(data)
-            self._write_data(anonymized_data)
-            logging.info(f"Data anonymized successfully. Output saved to {self.output_file}")
+            stats = AnonymizationStats()
+            start_time = time.perf_counter()
+            with open(self.input_file, 'r', newline='') as infile, \
+                 open(self.output_file, 'w', newline='') as outfile:
+                # Blank lines are skipped, as csv.DictReader does.
+                reader = filter(None, csv.reader(infile))
+                header = next(reader, None)
+                if header is not None:
+                    compiled = self.rules.compile(header, python_random(root_seed_sequence(self.seed)))
+                    writer = csv.writer(outfile)
+                    writer.writerow(compiled.fieldnames)
+                    for batch in self._read_data(reader):
+                        self._write_data(writer, self._process_data(compiled, batch))
+                        stats.rows += len(batch)
+                        stats.batches += 1
+                        stats.seconds = time.perf_counter() - start_time
+                        if self.progress_callback:
+                            self.progress_callback(stats)
+            stats.seconds = time.perf_counter() - start_time
+            logging.info(f"Data anonymized successfully. Output saved to {self.output_file} "
+                         f"({stats.rows} rows, {stats.rows_per_second:.0f} rows/s)")
+            return stats
         except (IOError, csv.Error) as e:
             logging.error(f"File handling error: {str(e)}")
             raise
@@ -38,103 +102,50 @@ class Anonymizer:
             logging.error(f"Unexpected error: {str(e)}")
             raise
 
-    def _read_data(self) -> List[Dict[str, str]]:
+    def _read_data(self, reader: Iterator[List[str]]) -> Iterator[List[List[str]]]:
         """
-        Reads data from the input CSV file.
+        Reads data from the input CSV file in batches.
 
-        Returns:
-            List[Dict[str, str]]: The data read from the CSV file.
+        Args:
+            reader (Iterator[List[str]]): The reader over the input rows.
+
+        Yields:
+            List[List[str]]: The next batch of at most `batch_size` rows.
         """
         try:
-            with open(self.input_file, 'r', newline='') as csvfile:
-                return list(csv.DictReader(csvfile))
+            while True:
+                batch = list(islice(reader, self.batch_size))
+                if not batch:
+                    return
+                yield batch
         except IOError as e:
             logging.error(f"Error reading input file: {str(e)}")
             raise
 
-    def _process_data(self, data: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    def _process_data(self, compiled: CompiledRules, data: List[List[str]]) -> List[List[str]]:
         """
         Processes the data to anonymize specified fields.
 
         Args:
-            data (List[Dict[str, str]]): The original data.
-
-        Returns:
-            List[Dict[str, str]]: The anonymized data.
-        """
-        return [self._anonymize_row(row) for row in data]
-
-    def _anonymize_row(self, row: Dict[str, str]) -> Dict[str, str]:
-        """
-        Anonymizes specified fields in a single row.
-
-        Args:
-            row (Dict[str, str]): The original row.
-
-        Returns:
-            Dict[str, str]: The anonymized row.
-        """
-        for field in self.fields_to_anonymize:
-            if field in row:
-                row[field] = self._anonymize_field(field, row[field])
-        return row
-
-    def _anonymize_field(self, field: str, value: str) -> str:
-        """
-        Anonymizes a single field value based on the field name.
-
-        Args:
-            field (str): The field name.
-            value (str): The original field value.
-
-        Returns:
-            str: The anonymized field value.
-        """
-        if field in ['first_name', 'last_name']:
-            return self._anonymize_name(value)
-        elif field == 'address':
-            return self._anonymize_address(value)
-        return value
-
-    @staticmethod
-    def _anonymize_name(name: str) -> str:
-        """
-        Anonymizes a name by keeping the first letter and replacing the rest with random letters.
-
-        Args:
-            name (str): The original name.
-
-        Returns:
-            str: The anonymized name.
-        """
-        return f"{name[0]}{''.join(random.choices(string.ascii_lowercase, k=5))}"
-
-    @staticmethod
-    def _anonymize_address(address: str) -> str:
-        """
-        Anonymizes an address by replacing the middle part with random letters.
-
-        Args:
-            address (str): The original address.
+            compiled (CompiledRules): The rules compiled for the input header.
+            data (List[List[str]]): The original rows.
 
         Returns:
-            str: The anonymized address.
+            List[List[str]]: The anonymized rows.
         """
-        parts = address.split()
-        return f"{random.randint(1, 99)} {''.join(random.choices(string.ascii_lowercase, k=5))} {parts[-1]}"
+        apply = compiled.apply
+        return [apply(row) for row in data]
 
-    def _write_data(self, data: List[Dict[str, str]]) -> None:
+    def _write_data(self, writer, data: List[List[str]]) -> None:
         """
-        Writes the anonymized data to the output CSV file.
+        Writes a batch of anonymized data to the output CSV file.
 
         Args:
-            data (List[Dict[str, str]]): The anonymized data.
+            writer: The csv writer over the output file.
+            data (List[List[str]]): The anonymized rows.
         """
         try:
-            with open(self.output_file, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
+            writer.writerows(data)
         except IOError as e:
             logging.error(f"Error writing output file: {str(e)}")
             raise
@@ -1,9 +1,11 @@
 import csv
-from typing import List, Dict
+import functools
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
-import random
 from datetime import datetime, timedelta
 import logging
+import numpy as np
+from anonymizer.seeding import python_random, root_seed_sequence
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -15,6 +17,11 @@ class MockDataGenerator:
         num_rows (int): The number of rows to generate.
         output_file (Path): The path to the output CSV file.
         fields (List[str]): The list of fields to be generated.
+
+    Rows are tuples in the column order of `COLUMNS`, restricted to `fields`.
+    In "columnar" mode whole blocks of `block_size` rows are drawn as NumPy
+    index arrays into lookup tables and written at once. The same `seed`
+    generates the same file.
     """
 
     FIRST_NAMES = ['Olivia', 'Liam', 'Emma', 'Noah', 'Ava', 'Oliver', 'Sophia', 'Elijah', 'Isabella', 
@@ -27,18 +34,39 @@ class MockDataGenerator:
                 'Fir Dr', 'Willow St', 'Elm Ave', 'Ash Ln', 'Cherry Blvd', 'Poplar Rd', 
                 'Dogwood Way', 'Hickory Dr']
 
-    def __init__(self, num_rows: int, output_file: Path, fields: List[str] = None):
+    COLUMNS = ['first_name', 'last_name', 'address', 'date_of_birth']
+    MODES = ('rows', 'columnar')
+
+    def __init__(self, num_rows: int, output_file: Path, fields: List[str] = None,
+                 mode: str = 'rows', block_size: int = 100000, seed: Optional[int] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unexpected mode {mode}")
         self.num_rows = num_rows
         self.output_file = output_file
-        self.fields = fields or ['first_name', 'last_name', 'address', 'date_of_birth']
+        self.mode = mode
+        self.block_size = block_size
+        self.seed_sequence = root_seed_sequence(seed)
+        self._rng = python_random(self.seed_sequence)
+        self.fields = fields or list(self.COLUMNS)
+        self.fieldnames = [field for field in self.COLUMNS if field in self.fields]
+        generators = {
+            'first_name': lambda: self._rng.choice(self.FIRST_NAMES),
+            'last_name': lambda: self._rng.choice(self.LAST_NAMES),
+            'address': self._generate_address,
+            'date_of_birth': self._generate_date,
+        }
+        self._column_generators: List[Callable[[], str]] = [generators[field] for field in self.fieldnames]
 
     def generate_mock_data(self) -> None:
         """
         Generates the mock data and writes it to the output file.
         """
         try:
-            data = self._generate_data()
-            self._write_data(data)
+            self._rng = python_random(self.seed_sequence)
+            if self.mode == 'columnar':
+                self._write_columnar_data()
+            else:
+                self._write_data(self._generate_data())
             logging.info(f"Mock data generated successfully. Output saved to {self.output_file}")
         except (IOError, csv.Error) as e:
             logging.error(f"File handling error: {str(e)}")
@@ -47,32 +75,23 @@ class MockDataGenerator:
             logging.error(f"Unexpected error: {str(e)}")
             raise
 
-    def _generate_data(self) -> List[Dict[str, str]]:
+    def _generate_data(self) -> Iterator[Tuple[str, ...]]:
         """
         Generates the specified number of rows of mock data.
 
         Returns:
-            List[Dict[str, str]]: The generated data.
+            Iterator[Tuple[str, ...]]: The generated rows.
         """
-        return [self._generate_row() for _ in range(self.num_rows)]
+        return (self._generate_row() for _ in range(self.num_rows))
 
-    def _generate_row(self) -> Dict[str, str]:
+    def _generate_row(self) -> Tuple[str, ...]:
         """
         Generates a single row of mock data.
 
         Returns:
-            Dict[str, str]: The generated row.
+            Tuple[str, ...]: The generated row, in the order of `fieldnames`.
         """
-        row = {}
-        if 'first_name' in self.fields:
-            row['first_name'] = random.choice(self.FIRST_NAMES)
-        if 'last_name' in self.fields:
-            row['last_name'] = random.choice(self.LAST_NAMES)
-        if 'address' in self.fields:
-            row['address'] = self._generate_address()
-        if 'date_of_birth' in self.fields:
-            row['date_of_birth'] = self._generate_date()
-        return row
+        return tuple(generate() for generate in self._column_generators)
 
     def _generate_address(self) -> str:
         """
@@ -81,10 +100,9 @@ class MockDataGenerator:
         Returns:
             str: The generated address.
         """
-        return f"{random.randint(1, 999)} {random.choice(self.ADDRESSES)}"
+        return f"{self._rng.randint(1, 999)} {self._rng.choice(self.ADDRESSES)}"
 
-    @staticmethod
-    def _generate_date() -> str:
+    def _generate_date(self) -> str:
         """
         Generates a random date of birth.
 
@@ -95,22 +113,76 @@ class MockDataGenerator:
         end_date = datetime(2005, 12, 31)
         time_between_dates = end_date - start_date
         days_between_dates = time_between_dates.days
-        random_number_of_days = random.randrange(days_between_dates)
+        random_number_of_days = self._rng.randrange(days_between_dates)
         random_date = start_date + timedelta(days=random_number_of_days)
         return random_date.strftime("%d/%m/%Y")
 
-    def _write_data(self, data: List[Dict[str, str]]) -> None:
+    def _write_data(self, data: Iterator[Tuple[str, ...]]) -> None:
         """
         Writes the generated data to the output CSV file.
 
         Args:
-            data (List[Dict[str, str]]): The generated data.
+            data (Iterator[Tuple[str, ...]]): The generated rows.
         """
         try:
             with open(self.output_file, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=data[0].keys())
-                writer.writeheader()
+                writer = csv.writer(csvfile)
+                writer.writerow(self.fieldnames)
                 writer.writerows(data)
         except IOError as e:
             logging.error(f"Error writing output file: {str(e)}")
             raise
+
+    def _write_columnar_data(self) -> None:
+        """
+        Generates the data block by block and writes it to the output CSV file.
+        """
+        rng = np.random.default_rng(self.seed_sequence)
+        try:
+            with open(self.output_file, 'w', newline='') as csvfile:
+                csv.writer(csvfile).writerow(self.fieldnames)
+                for start in range(0, self.num_rows, self.block_size):
+                    rows = min(self.block_size, self.num_rows - start)
+                    csvfile.write(generate_columnar_block(rng, rows, self.fieldnames))
+        except IOError as e:
+            logging.error(f"Error writing output file: {str(e)}")
+            raise
+
+@functools.lru_cache(maxsize=None)
+def _lookup_tables() -> Dict[str, np.ndarray]:
+    """
+    Builds every value a column can take: names, the 999 house numbers times the
+    streets, and the ~20k dates of birth, formatted once.
+    """
+    start_date = datetime(1950, 1, 1)
+    days_between_dates = (datetime(2005, 12, 31) - start_date).days
+    return {
+        'first_name': np.array(MockDataGenerator.FIRST_NAMES, dtype=object),
+        'last_name': np.array(MockDataGenerator.LAST_NAMES, dtype=object),
+        'address': np.array([f"{number} {street}" for number in range(1, 1000)
+                             for street in MockDataGenerator.ADDRESSES], dtype=object),
+        'date_of_birth': np.array([(start_date + timedelta(days=day)).strftime("%d/%m/%Y")
+                                   for day in range(days_between_dates)], dtype=object),
+    }
+
+def generate_columnar_block(rng: np.random.Generator, rows: int, fieldnames: Sequence[str]) -> str:
+    """
+    Generates a block of mock data as CSV text.
+
+    Every column is an array of random indices into its lookup table. No value
+    contains a delimiter or quote, so lines are joined without csv quoting.
+
+    Args:
+        rng (np.random.Generator): The random number generator.
+        rows (int): The number of rows to generate.
+        fieldnames (Sequence[str]): The columns to generate.
+
+    Returns:
+        str: The CSV lines, terminated by "\r\n" like csv.writer.
+    """
+    tables = _lookup_tables()
+    columns = [tables[field][rng.integers(0, len(tables[field]), rows)].tolist() for field in fieldnames]
+    if not rows:
+        return ''
+    return '\r\n'.join(map(','.join, zip(*columns))) + '\r\n'
+
@@ -0,0 +1,83 @@
+import functools
+import hashlib
+import hmac
+import string
+from typing import Union
+
+class Pseudonymizer:
+    """
+    Maps values to deterministic pseudonyms derived from a secret key.
+
+    A value always gets the same pseudonym for the same key, in every row, run
+    and process, so anonymized tables can still be joined. Pseudonyms have the
+    same shape as the random ones: a name keeps its first letter followed by
+    five lowercase letters, and an address becomes "<1-99> <5 letters> <last word>".
+
+    The letters and the house number are taken from the HMAC-SHA256 digest of
+    the value: letter i is `ascii_lowercase[digest[i] % 26]` and the house
+    number is `digest[5] % 99 + 1`.
+
+    Attributes:
+        key (bytes): The secret HMAC key.
+        cache_size (int): The number of pseudonyms memoized per kind of value.
+    """
+
+    def __init__(self, key: Union[str, bytes], cache_size: int = 65536):
+        self.key = key.encode() if isinstance(key, str) else key
+        self.cache_size = cache_size
+        self._init_caches()
+
+    def _init_caches(self) -> None:
+        # Per-instance LRU caches; names and addresses come from small
+        # vocabularies, so most lookups skip the HMAC.
+        self.name = functools.lru_cache(maxsize=self.cache_size)(self._name)
+        self.address = functools.lru_cache(maxsize=self.cache_size)(self._address)
+
+    def __getstate__(self):
+        return {'key': self.key, 'cache_size': self.cache_size}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_caches()
+
+    def digest(self, value: str) -> bytes:
+        """
+        Computes the keyed digest of a value.
+
+        Args:
+            value (str): The original value.
+
+        Returns:
+            bytes: The HMAC-SHA256 digest.
+        """
+        return hmac.new(self.key, value.encode(), hashlib.sha256).digest()
+
+    def _name(self, name: str) -> str:
+        """
+        Pseudonymizes a name by keeping the first letter and deriving five letters from the key.
+
+        Args:
+            name (str): The original name.
+
+        Returns:
+            str: The pseudonymized name.
+        """
+        digest = self.digest(name)
+        return f"{name[0]}{_letters(digest[:5])}"
+
+    def _address(self, address: str) -> str:
+        """
+        Pseudonymizes an address by deriving the house number and street name from the key.
+
+        Args:
+            address (str): The original address.
+
+        Returns:
+            str: The pseudonymized address.
+        """
+        parts = address.split()
+        digest = self.digest(address)
+        return f"{digest[5] % 99 + 1} {_letters(digest[:5])} {parts[-1]}"
+
+def _letters(data: bytes) -> str:
+    return ''.join(string.ascii_lowercase[b % 26] for b in data)
@@ -0,0 +1,224 @@
+import dataclasses
+import functools
+import json
+import random
+import string
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from anonymizer.pseudonymizer import Pseudonymizer
+
+Rule = Union[str, Dict[str, Any]]
+ColumnFunction = Callable[[str], str]
+
+def _random_name(rng: random.Random) -> ColumnFunction:
+    choices = rng.choices
+    return lambda name: f"{name[0]}{''.join(choices(string.ascii_lowercase, k=5))}"
+
+def _random_address(rng: random.Random) -> ColumnFunction:
+    def address(value: str) -> str:
+        parts = value.split()
+        return f"{rng.randint(1, 99)} {''.join(rng.choices(string.ascii_lowercase, k=5))} {parts[-1]}"
+    return address
+
+def _keep(rule: Dict[str, Any], pseudonymizer: Optional[Pseudonymizer], rng: random.Random) -> ColumnFunction:
+    return str
+
+def _mask(rule: Dict[str, Any], pseudonymizer: Optional[Pseudonymizer], rng: random.Random) -> ColumnFunction:
+    keep = rule.get("keep", 1)
+    char = rule.get("char", "*")
+    return lambda value: value[:keep] + char * (len(value) - keep)
+
+def _hash(rule: Dict[str, Any], pseudonymizer: Optional[Pseudonymizer], rng: random.Random) -> ColumnFunction:
+    length = rule.get("length", 16)
+    digest = pseudonymizer.digest
+    return functools.lru_cache(maxsize=65536)(lambda value: digest(value).hex()[:length])
+
+def _pseudonym(rule: Dict[str, Any], pseudonymizer: Optional[Pseudonymizer], rng: random.Random) -> ColumnFunction:
+    kind = rule.get("kind", "name")
+    if kind not in ("name", "address"):
+        raise ValueError(f"Unexpected pseudonym kind {kind}")
+    if pseudonymizer:
+        return pseudonymizer.name if kind == "name" else pseudonymizer.address
+    return _random_name(rng) if kind == "name" else _random_address(rng)
+
+def _date_shift(rule: Dict[str, Any], pseudonymizer: Optional[Pseudonymizer], rng: random.Random) -> ColumnFunction:
+    days = rule.get("days", 30)
+    fmt = rule.get("format", "%d/%m/%Y")
+
+    def shift(value: str) -> str:
+        if not value:
+            return value
+        if pseudonymizer:
+            offset = int.from_bytes(pseudonymizer.digest(value)[:4], "big") % (2 * days + 1) - days
+        else:
+            offset = rng.randint(-days, days)
+        return (datetime.strptime(value, fmt) + timedelta(days=offset)).strftime(fmt)
+    return shift
+
+def _generalize(rule: Dict[str, Any], pseudonymizer: Optional[Pseudonymizer], rng: random.Random) -> ColumnFunction:
+    if "bucket" in rule:
+        size = rule["bucket"]
+
+        def bucket(value: str) -> str:
+            if not value:
+                return value
+            low = int(float(value)) // size * size
+            return f"{low}-{low + size - 1}"
+        return bucket
+
+    input_format = rule.get("input_format", "%d/%m/%Y")
+    fmt = rule.get("format", "%Y")
+    return functools.lru_cache(maxsize=65536)(
+        lambda value: datetime.strptime(value, input_format).strftime(fmt) if value else value
+    )
+
+# Strategy name -> builder of the column function; "drop" removes the column.
+_STRATEGIES: Dict[str, Optional[Callable[[Dict[str, Any], Optional[Pseudonymizer], random.Random],
+                                          ColumnFunction]]] = {
+    "keep": _keep,
+    "mask": _mask,
+    "hash": _hash,
+    "pseudonym": _pseudonym,
+    "date_shift": _date_shift,
+    "generalize": _generalize,
+    "drop": None,
+}
+
+@dataclasses.dataclass
+class CompiledRules:
+    """
+    Rules compiled for one header.
+
+    Attributes:
+        fieldnames (List[str]): The output column names.
+        table (List[Tuple[int, ColumnFunction]]): Input position and function of every output column.
+    """
+    fieldnames: List[str]
+    table: List[Tuple[int, ColumnFunction]]
+
+    def apply(self, row: Sequence[str]) -> List[str]:
+        """
+        Anonymizes a positional row.
+
+        Args:
+            row (Sequence[str]): The values of the input columns.
+
+        Returns:
+            List[str]: The values of the output columns.
+
+        Raises:
+            ValueError: If the row has fewer values than the header.
+        """
+        try:
+            return [function(row[position]) for position, function in self.table]
+        except IndexError:
+            width = max((position + 1 for position, _ in self.table), default=0)
+            if len(row) < width:
+                raise ValueError(f"Expected at least {width} values, got {len(row)}: {list(row)}") from None
+            raise
+
+@dataclasses.dataclass
+class AnonymizationRules:
+    """
+    Declarative anonymization rules: a strategy per column.
+
+    A rule is either a strategy name or an object with a "strategy" key and its
+    options:
+
+    - keep: the value is left as is; columns without a rule are kept.
+    - mask: keeps the first `keep` (1) characters and replaces the rest with `char` ("*").
+    - hash: the first `length` (16) hex digits of the keyed HMAC-SHA256 digest; requires a
+      pseudonymizer, because an unkeyed hash of names, emails or IDs is reversed by hashing
+      candidate values.
+    - pseudonym: a pseudonym of `kind` "name" or "address"; keyed pseudonyms are deterministic.
+    - date_shift: moves a date in `format` ("%d/%m/%Y") by up to `days` (30) days.
+    - generalize: a numeric range of `bucket` width, or a date in `input_format`
+      ("%d/%m/%Y") reformatted to `format` ("%Y").
+    - drop: the column is removed from the output.
+
+    Attributes:
+        columns (Dict[str, Rule]): The rule of every column.
+        pseudonymizer (Optional[Pseudonymizer]): Keys hash and makes pseudonym and date_shift deterministic.
+    """
+    columns: Dict[str, Rule]
+    pseudonymizer: Optional[Pseudonymizer] = None
+
+    @classmethod
+    def from_fields(cls, fields: List[str], pseudonymizer: Optional[Pseudonymizer] = None) -> "AnonymizationRules":
+        """
+        Builds the rules of the original field list: names and addresses get pseudonyms.
+
+        Args:
+            fields (List[str]): The fields to anonymize.
+            pseudonymizer (Optional[Pseudonymizer]): Makes the pseudonyms deterministic.
+
+        Returns:
+            AnonymizationRules: The rules.
+        """
+        columns: Dict[str, Rule] = {}
+        for field in fields:
+            if field in ("first_name", "last_name"):
+                columns[field] = {"strategy": "pseudonym", "kind": "name"}
+            elif field == "address":
+                columns[field] = {"strategy": "pseudonym", "kind": "address"}
+        return cls(columns, pseudonymizer)
+
+    @classmethod
+    def load(cls, rules_file: Path, key: Optional[str] = None) -> "AnonymizationRules":
+        """
+        Loads rules from a JSON file of the form {"columns": {"<column>": <rule>}}.
+
+        Args:
+            rules_file (Path): The path to the rules file.
+            key (Optional[str]): The secret key for deterministic strategies.
+
+        Returns:
+            AnonymizationRules: The rules.
+        """
+        with open(rules_file) as f:
+            data = json.load(f)
+        rules = cls(data["columns"], Pseudonymizer(key) if key else None)
+        rules.validate()
+        return rules
+
+    def validate(self) -> None:
+        for column, rule in self.columns.items():
+            strategy = _normalize(rule).get("strategy")
+            if strategy is None:
+                raise ValueError(f"Missing strategy for column {column}")
+            if strategy not in _STRATEGIES:
+                raise ValueError(f"Unexpected strategy {strategy} for column {column}")
+            if strategy == "hash" and self.pseudonymizer is None:
+                raise ValueError(f"Strategy hash for column {column} requires a key")
+
+    def compile(self, fieldnames: Sequence[str], rng: Optional[random.Random] = None) -> CompiledRules:
+        """
+        Compiles the rules to a function table for a header.
+
+        Rules for columns that are not in the header are ignored.
+
+        Args:
+            fieldnames (Sequence[str]): The input column names.
+            rng (Optional[random.Random]): The random stream of the random strategies;
+                the global `random` module when omitted.
+
+        Returns:
+            CompiledRules: The output column names and the function table.
+        """
+        self.validate()
+        # The random module exposes the methods of its hidden global Random instance.
+        rng = rng or random
+        output_fieldnames, table = [], []
+        for position, name in enumerate(fieldnames):
+            rule = _normalize(self.columns.get(name, "keep"))
+            builder = _STRATEGIES[rule["strategy"]]
+            if builder is None:
+                continue
+            output_fieldnames.append(name)
+            table.append((position, builder(rule, self.pseudonymizer, rng)))
+        return CompiledRules(output_fieldnames, table)
+
+def _normalize(rule: Rule) -> Dict[str, Any]:
+    return {"strategy": rule} if isinstance(rule, str) else rule
@@ -0,0 +1,47 @@
+import random
+from typing import Optional
+
+import numpy as np
+
+def root_seed_sequence(seed: Optional[int] = None) -> np.random.SeedSequence:
+    """
+    Creates the root of the random streams of a run.
+
+    Args:
+        seed (Optional[int]): The seed; fresh OS entropy when omitted.
+
+    Returns:
+        np.random.SeedSequence: The root seed sequence.
+    """
+    return np.random.SeedSequence(seed)
+
+def child_seed_sequence(root: np.random.SeedSequence, index: int) -> np.random.SeedSequence:
+    """
+    Derives the independent stream of the chunk, range or partition `index`.
+
+    Equal to `root.spawn(index + 1)[index]`, without having to know the number
+    of children up front.
+
+    Args:
+        root (np.random.SeedSequence): The root seed sequence.
+        index (int): The position of the chunk in the data.
+
+    Returns:
+        np.random.SeedSequence: The child seed sequence.
+    """
+    return np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (index,))
+
+def python_random(seed_sequence: np.random.SeedSequence) -> random.Random:
+    """
+    Creates a stdlib Random seeded from a seed sequence.
+
+    The stdlib generator is faster than a NumPy Generator for one value at a
+    time, which is how rows are generated and anonymized.
+
+    Args:
+        seed_sequence (np.random.SeedSequence): The seed sequence of the stream.
+
+    Returns:
+        random.Random: The seeded generator.
+    """
+    return random.Random(int.from_bytes(seed_sequence.generate_state(4).tobytes(), 'little'))
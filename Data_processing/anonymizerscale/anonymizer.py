@@ -1,61 +1,229 @@
 # anonymizer.py
 
+import collections
 import csv
-import random
-import string
-from typing import Dict, Iterator
+import io
+import os
+import shutil
+import tempfile
+from typing import Iterator, List, Optional, Tuple
 from pathlib import Path
 import logging
 import multiprocessing as mp
 from itertools import islice
+from anonymizer.pseudonymizer import Pseudonymizer
+from anonymizer.rules import AnonymizationRules
+from anonymizer.seeding import child_seed_sequence, python_random, root_seed_sequence
+import numpy as np
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Input header, rules and root seed sequence, set in every worker by _init_worker.
+_FIELDNAMES: List[str] = []
+_RULES: Optional[AnonymizationRules] = None
+_SEED_SEQUENCE: Optional[np.random.SeedSequence] = None
+
+def _init_worker(fieldnames: List[str], rules: AnonymizationRules, seed_sequence: np.random.SeedSequence) -> None:
+    global _FIELDNAMES, _RULES, _SEED_SEQUENCE
+    _FIELDNAMES, _RULES, _SEED_SEQUENCE = fieldnames, rules, seed_sequence
+
+def _compile_rules(index: int):
+    # Every chunk or range gets its own random stream, derived from its position.
+    return _RULES.compile(_FIELDNAMES, python_random(child_seed_sequence(_SEED_SEQUENCE, index)))
+
+def _anonymize_chunk(task: Tuple[int, bytes]) -> bytes:
+    """Parses a chunk of raw CSV lines, anonymizes it and returns the CSV bytes."""
+    index, data = task
+    return _anonymize_data(_compile_rules(index).apply, data)
+
+def _anonymize_data(apply, data: bytes) -> bytes:
+    reader = csv.reader(io.StringIO(data.decode(), newline=''))
+    output = io.StringIO(newline='')
+    csv.writer(output).writerows(map(apply, filter(None, reader)))
+    return output.getvalue().encode()
+
+def _read_records(infile, end: int, chunk_bytes: int) -> Iterator[bytes]:
+    """Reads whole records up to the byte offset `end`, about `chunk_bytes` at a time."""
+    while infile.tell() < end:
+        data = infile.read(min(chunk_bytes, end - infile.tell()))
+        if not data.endswith(b'\n'):
+            data += infile.readline()
+        odd_quotes = data.count(b'"') % 2
+        while odd_quotes and infile.tell() < end:
+            line = infile.readline()
+            data += line
+            odd_quotes ^= line.count(b'"') % 2
+        yield data
+
+def _anonymize_range(index: int, input_file: Path, part_file: Path, start: int, end: int,
+                     chunk_bytes: int) -> Path:
+    """Anonymizes the records in the byte range [start, end) into a part file."""
+    apply = _compile_rules(index).apply
+    with open(input_file, 'rb') as infile, open(part_file, 'wb') as outfile:
+        infile.seek(start)
+        for data in _read_records(infile, end, chunk_bytes):
+            outfile.write(_anonymize_data(apply, data))
+    return part_file
+
+def _append_file(outfile, part_file: Path) -> None:
+    """Appends a file to `outfile` in the kernel where the platform allows it."""
+    outfile.flush()
+    with open(part_file, 'rb') as part:
+        remaining = os.fstat(part.fileno()).st_size
+        offset = 0
+        try:
+            while remaining > 0:
+                if hasattr(os, 'copy_file_range'):
+                    copied = os.copy_file_range(part.fileno(), outfile.fileno(), remaining)
+                else:
+                    copied = os.sendfile(outfile.fileno(), part.fileno(), offset, remaining)
+                if copied == 0:
+                    break
+                offset += copied
+                remaining -= copied
+        except (AttributeError, OSError):
+            pass
+        if remaining > 0:
+            part.seek(offset)
+            outfile.seek(0, os.SEEK_END)
+            shutil.copyfileobj(part, outfile)
+
+def _star_anonymize_range(task: Tuple) -> Path:
+    return _anonymize_range(*task)
+
 class Anonymizer:
-    def __init__(self, input_file: Path, output_file: Path, chunk_size: int = 500000):
+    """
+    Anonymizes a large CSV file with a pool of worker processes.
+
+    With the "ranges" strategy the input is split into record-aligned byte
+    ranges; every worker reads and parses its own range and writes a part file,
+    and the parts are concatenated in order. With the "pipeline" strategy this
+    process reads raw chunks that the workers anonymize while results are
+    written.
+
+    Columns are anonymized by `rules`; by default names and addresses get
+    pseudonyms, which are deterministic and keyed when a pseudonymizer is given.
+
+    Random strategies draw from one stream per chunk or range, spawned from
+    `seed`. Ranges are `chunk_bytes` long, so a seeded run gives the same
+    output with any number of processes.
+    """
+
+    STRATEGIES = ('ranges', 'pipeline')
+
+    def __init__(self, input_file: Path, output_file: Path, chunk_size: int = 100000,
+                 processes: Optional[int] = None, max_pending_chunks: Optional[int] = None,
+                 strategy: str = 'ranges', chunk_bytes: int = 8 * 1024 * 1024,
+                 pseudonymizer: Optional[Pseudonymizer] = None,
+                 rules: Optional[AnonymizationRules] = None, seed: Optional[int] = None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unexpected strategy {strategy}")
         self.input_file = input_file
         self.output_file = output_file
         self.chunk_size = chunk_size
+        self.processes = processes or mp.cpu_count()
+        self.max_pending_chunks = max_pending_chunks or 2 * self.processes
+        self.strategy = strategy
+        self.chunk_bytes = chunk_bytes
+        self.pseudonymizer = pseudonymizer
+        self.seed = seed
+        self.rules = rules or AnonymizationRules.from_fields(['first_name', 'last_name', 'address'], pseudonymizer)
 
     def anonymize_data(self) -> None:
         try:
-            with mp.Pool(processes=mp.cpu_count()) as pool:
-                self._process_in_parallel(pool)
+            with open(self.input_file, 'rb') as infile, open(self.output_file, 'wb') as outfile:
+                fieldnames = next(csv.reader([infile.readline().decode()]), [])
+                header = io.StringIO(newline='')
+                if fieldnames:
+                    csv.writer(header).writerow(self.rules.compile(fieldnames).fieldnames)
+                outfile.write(header.getvalue().encode())
+                with mp.Pool(processes=self.processes, initializer=_init_worker,
+                             initargs=(fieldnames, self.rules, root_seed_sequence(self.seed))) as pool:
+                    if self.strategy == 'ranges':
+                        self._process_ranges(pool, infile.tell(), outfile)
+                    else:
+                        self._process_in_parallel(pool, infile, outfile)
             logging.info(f"Data anonymized successfully. Output saved to {self.output_file}")
         except Exception as e:
             logging.error(f"Error during anonymization: {str(e)}")
             raise
 
-    def _process_in_parallel(self, pool: mp.Pool) -> None:
-        with open(self.input_file, 'r', newline='') as infile, \
-             open(self.output_file, 'w', newline='') as outfile:
-            
-            reader = csv.DictReader(infile)
-            writer = csv.DictWriter(outfile, fieldnames=reader.fieldnames)
-            writer.writeheader()
-
-            while True:
-                chunk = list(islice(reader, self.chunk_size))
-                if not chunk:
+    def _process_ranges(self, pool: mp.Pool, start: int, outfile) -> None:
+        size = os.path.getsize(self.input_file)
+        ranges = self._split_ranges(start, max(1, -(-(size - start) // self.chunk_bytes)))
+        parts_dir = Path(tempfile.mkdtemp(dir=Path(self.output_file).parent))
+        try:
+            tasks = [
+                (i, self.input_file, parts_dir / f"part-{i:05d}.csv", lo, hi, self.chunk_bytes)
+                for i, (lo, hi) in enumerate(ranges)
+            ]
+            # Parts are appended in order as soon as each one is ready.
+            for part_file in pool.imap(_star_anonymize_range, tasks):
+                _append_file(outfile, part_file)
+                os.remove(part_file)
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+    def _split_ranges(self, start: int, parts: int) -> List[Tuple[int, int]]:
+        """
+        Splits the records after `start` into about `parts` byte ranges.
+
+        Each boundary is the first line end after an even split point that is
+        not inside a quoted field. Quote parity is tracked with one pass of
+        bytes.count over the file, so quoted newlines never split a record.
+        """
+        size = os.path.getsize(self.input_file)
+        targets = [start + (size - start) * i // parts for i in range(1, parts)]
+        bounds = [start]
+        with open(self.input_file, 'rb') as f:
+            f.seek(start)
+            position, odd_quotes = start, 0
+            for target in targets:
+                if target <= position:
+                    continue
+                while position < target:
+                    block = f.read(min(self.chunk_bytes, target - position))
+                    odd_quotes ^= block.count(b'"') % 2
+                    position += len(block)
+                while True:
+                    line = f.readline()
+                    if not line:
+                        break
+                    odd_quotes ^= line.count(b'"') % 2
+                    position += len(line)
+                    if not odd_quotes:
+                        break
+                if position >= size:
                     break
-                results = pool.map(self._anonymize_row, chunk, chunksize=10000)
-                writer.writerows(results)
-
-    @staticmethod
-    def _anonymize_row(row: Dict[str, str]) -> Dict[str, str]:
-        return {
-            'first_name': Anonymizer._anonymize_name(row['first_name']),
-            'last_name': Anonymizer._anonymize_name(row['last_name']),
-            'address': Anonymizer._anonymize_address(row['address']),
-            'date_of_birth': row['date_of_birth']
-        }
-
-    @staticmethod
-    def _anonymize_name(name: str) -> str:
-        return f"{name[0]}{''.join(random.choices(string.ascii_lowercase, k=5))}"
-
-    @staticmethod
-    def _anonymize_address(address: str) -> str:
-        parts = address.split()
-        return f"{random.randint(1, 99)} {''.join(random.choices(string.ascii_lowercase, k=5))} {parts[-1]}"
+                bounds.append(position)
+        bounds.append(size)
+        return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
 
+    def _process_in_parallel(self, pool: mp.Pool, infile, outfile) -> None:
+        # Reading and writing (this thread) overlap with anonymizing (the
+        # workers). At most max_pending_chunks results are in flight and they
+        # are written in input order. A worker error is raised by get() here,
+        # so the pool can be terminated.
+        pending = collections.deque()
+        for task in enumerate(self._read_chunks(infile)):
+            if len(pending) >= self.max_pending_chunks:
+                outfile.write(pending.popleft().get())
+            pending.append(pool.apply_async(_anonymize_chunk, (task,)))
+        while pending:
+            outfile.write(pending.popleft().get())
+
+    def _read_chunks(self, infile) -> Iterator[bytes]:
+        while True:
+            lines = list(islice(infile, self.chunk_size))
+            if not lines:
+                return
+            data = b''.join(lines)
+            # An odd number of quotes means the last record continues on the next line.
+            odd_quotes = data.count(b'"') % 2
+            while odd_quotes:
+                line = infile.readline()
+                if not line:
+                    break
+                data += line
+                odd_quotes ^= line.count(b'"') % 2
+            yield data
@@ -1,31 +1,66 @@
 # generator.py
 
 import csv
-from typing import Dict, Iterator
+import io
+from typing import Iterator, Optional, Tuple
 from pathlib import Path
 import random
 from datetime import datetime, timedelta
 import logging
 import multiprocessing as mp
+import numpy as np
+from anonymizer.generator import generate_columnar_block
+from anonymizer.seeding import child_seed_sequence, python_random, root_seed_sequence
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+FIELDNAMES = ['first_name', 'last_name', 'address', 'date_of_birth']
+
+def _generate_chunk(rows: int, mode: str, seed_sequence: np.random.SeedSequence) -> bytes:
+    """Generates a chunk of rows in a worker and returns it as CSV bytes."""
+    if mode == 'columnar':
+        return generate_columnar_block(np.random.default_rng(seed_sequence), rows, FIELDNAMES).encode()
+    rng = python_random(seed_sequence)
+    output = io.StringIO(newline='')
+    csv.writer(output).writerows(MockDataGenerator._generate_row(rng) for _ in range(rows))
+    return output.getvalue().encode()
+
+def _star_generate_chunk(task: Tuple) -> bytes:
+    return _generate_chunk(*task)
+
 class MockDataGenerator:
-    FIRST_NAMES = ['Olivia', 'Liam', 'Emma', 'Noah', 'Ava', 'Oliver', 'Sophia', 'Elijah', 'Isabella', 
-                'James', 'Mia', 'Benjamin', 'Charlotte', 'Lucas', 'Amelia', 'Henry', 'Harper', 
+    """
+    Generates mock data with a pool of worker processes.
+
+    Every worker generates whole chunks and returns them as CSV bytes. Each
+    chunk has its own random stream spawned from `seed`, so the output only
+    depends on the seed and the chunk size, not on the number of processes.
+    """
+
+    FIRST_NAMES = ['Olivia', 'Liam', 'Emma', 'Noah', 'Ava', 'Oliver', 'Sophia', 'Elijah', 'Isabella',
+                'James', 'Mia', 'Benjamin', 'Charlotte', 'Lucas', 'Amelia', 'Henry', 'Harper',
                 'Alexander', 'Evelyn', 'Sebastian', 'Ella', 'Jack']
-    LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 
-                'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 
+    LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez',
+                'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor',
                 'Moore', 'Jackson', 'Martin', 'Lee']
-    ADDRESSES = ['Pine St', 'Maple Ave', 'Cedar Lane', 'Oak Blvd', 'Birch Rd', 'Spruce Way', 
-                'Fir Dr', 'Willow St', 'Elm Ave', 'Ash Ln', 'Cherry Blvd', 'Poplar Rd', 
+    ADDRESSES = ['Pine St', 'Maple Ave', 'Cedar Lane', 'Oak Blvd', 'Birch Rd', 'Spruce Way',
+                'Fir Dr', 'Willow St', 'Elm Ave', 'Ash Ln', 'Cherry Blvd', 'Poplar Rd',
                 'Dogwood Way', 'Hickory Dr']
+    START_DATE = datetime(1950, 1, 1)
+    DAYS_BETWEEN_DATES = (datetime(2005, 12, 31) - START_DATE).days
 
+    MODES = ('rows', 'columnar')
 
-    def __init__(self, num_rows: int, output_file: Path, chunk_size: int = 500000):
+    def __init__(self, num_rows: int, output_file: Path, chunk_size: int = 500000, mode: str = 'rows',
+                 seed: Optional[int] = None, processes: Optional[int] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unexpected mode {mode}")
         self.num_rows = num_rows
         self.output_file = output_file
         self.chunk_size = chunk_size
+        self.mode = mode
+        self.seed = seed
+        self.processes = processes or mp.cpu_count()
 
     def generate_mock_data(self) -> None:
         try:
@@ -36,38 +71,32 @@ class MockDataGenerator:
             raise
 
     def _write_data(self) -> None:
-        with open(self.output_file, 'w', newline='') as csvfile:
-            fieldnames = ['first_name', 'last_name', 'address', 'date_of_birth']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+        root = root_seed_sequence(self.seed)
+        tasks = [(rows, self.mode, child_seed_sequence(root, i)) for i, rows in enumerate(self._generate_data_chunks())]
+        with open(self.output_file, 'wb') as outfile:
+            header = io.StringIO(newline='')
+            csv.writer(header).writerow(FIELDNAMES)
+            outfile.write(header.getvalue().encode())
 
-            with mp.Pool(processes=mp.cpu_count()) as pool:
-                for chunk in self._generate_data_chunks():
-                    results = pool.map(self._generate_row, chunk, chunksize=10000)
-                    writer.writerows(results)
+            with mp.Pool(processes=self.processes) as pool:
+                for data in pool.imap(_star_generate_chunk, tasks):
+                    outfile.write(data)
 
-    def _generate_data_chunks(self) -> Iterator[range]:
+    def _generate_data_chunks(self) -> Iterator[int]:
         for i in range(0, self.num_rows, self.chunk_size):
-            yield range(min(self.chunk_size, self.num_rows - i))
-
-    def _generate_row(self, _: int) -> Dict[str, str]:
-        return {
-            'first_name': random.choice(self.FIRST_NAMES),
-            'last_name': random.choice(self.LAST_NAMES),
-            'address': self._generate_address(),
-            'date_of_birth': self._generate_date()
-        }
+            yield min(self.chunk_size, self.num_rows - i)
 
-    def _generate_address(self) -> str:
-        return f"{random.randint(1, 999)} {random.choice(self.ADDRESSES)}"
+    @staticmethod
+    def _generate_row(rng: random.Random) -> Tuple[str, str, str, str]:
+        return (
+            rng.choice(MockDataGenerator.FIRST_NAMES),
+            rng.choice(MockDataGenerator.LAST_NAMES),
+            f"{rng.randint(1, 999)} {rng.choice(MockDataGenerator.ADDRESSES)}",
+            MockDataGenerator._generate_date(rng)
+        )
 
     @staticmethod
-    def _generate_date() -> str:
-        start_date = datetime(1950, 1, 1)
-        end_date = datetime(2005, 12, 31)
-        time_between_dates = end_date - start_date
-        days_between_dates = time_between_dates.days
-        random_number_of_days = random.randrange(days_between_dates)
-        random_date = start_date + timedelta(days=random_number_of_days)
+    def _generate_date(rng: random.Random) -> str:
+        random_number_of_days = rng.randrange(MockDataGenerator.DAYS_BETWEEN_DATES)
+        random_date = MockDataGenerator.START_DATE + timedelta(days=random_number_of_days)
         return random_date.strftime("%d/%m/%Y")
-
@@ -0,0 +1,85 @@
+import argparse
+import csv
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import random
+import string
+import tempfile
+from pathlib import Path
+import logging
+import time
+from anonymizer.anonymizer import Anonymizer
+from anonymizer.generator import MockDataGenerator
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+FIELDS_TO_ANONYMIZE = ['first_name', 'last_name', 'address']
+
+# Dict-based reference implementations, as the package worked before rows became positional.
+def generate_dict_rows(generator: MockDataGenerator, output_file: Path) -> None:
+    with open(output_file, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=generator.fieldnames)
+        writer.writeheader()
+        for _ in range(generator.num_rows):
+            writer.writerow({
+                'first_name': random.choice(generator.FIRST_NAMES),
+                'last_name': random.choice(generator.LAST_NAMES),
+                'address': generator._generate_address(),
+                'date_of_birth': generator._generate_date(),
+            })
+
+def anonymize_dict_rows(input_file: Path, output_file: Path) -> None:
+    with open(input_file, 'r', newline='') as infile, open(output_file, 'w', newline='') as outfile:
+        reader = csv.DictReader(infile)
+        writer = csv.DictWriter(outfile, fieldnames=reader.fieldnames)
+        writer.writeheader()
+        for row in reader:
+            for field in FIELDS_TO_ANONYMIZE:
+                if field in row:
+                    if field in ['first_name', 'last_name']:
+                        row[field] = f"{row[field][0]}{''.join(random.choices(string.ascii_lowercase, k=5))}"
+                    else:
+                        parts = row[field].split()
+                        row[field] = (f"{random.randint(1, 99)} "
+                                      f"{''.join(random.choices(string.ascii_lowercase, k=5))} {parts[-1]}")
+            writer.writerow(row)
+
+def timed(label: str, num_rows: int, function, *args) -> float:
+    start_time = time.time()
+    function(*args)
+    seconds = time.time() - start_time
+    logging.info(f"{label}: {seconds:.2f} seconds ({num_rows / seconds:.0f} rows/s)")
+    return seconds
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compares dict-based and positional CSV rows",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--num_rows', type=int, default=20_000_000, help='Number of rows to generate')
+    parser.add_argument('--output_dir', type=str, default=None,
+                        help='Directory for the CSV files; a temporary directory when omitted')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.output_dir:
+        Path(args.output_dir).mkdir(exist_ok=True)
+        run(args.num_rows, Path(args.output_dir))
+    else:
+        with tempfile.TemporaryDirectory() as output_dir:
+            run(args.num_rows, Path(output_dir))
+
+def run(num_rows: int, output_dir: Path) -> None:
+    generator = MockDataGenerator(num_rows=num_rows, output_file=output_dir / 'data.csv')
+
+    dict_gen = timed("Generation, dict rows", num_rows, generate_dict_rows, generator, output_dir / 'dict_data.csv')
+    tuple_gen = timed("Generation, positional rows", num_rows, generator.generate_mock_data)
+    dict_anon = timed("Anonymization, dict rows", num_rows, anonymize_dict_rows,
+                      output_dir / 'data.csv', output_dir / 'dict_anonymized.csv')
+    anonymizer = Anonymizer(output_dir / 'data.csv', output_dir / 'anonymized.csv', FIELDS_TO_ANONYMIZE)
+    tuple_anon = timed("Anonymization, positional rows", num_rows, anonymizer.anonymize_data)
+
+    logging.info(f"Speedup: generation {dict_gen / tuple_gen:.2f}x, anonymization {dict_anon / tuple_anon:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,19 @@
 from pyspark.sql import SparkSession
-from pyspark.sql.functions import udf, col
-from pyspark.sql.types import StringType
+from pyspark.sql import functions as F
+from pyspark import StorageLevel
+import hashlib
 import random
 import string
 import logging
 from pathlib import Path
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import argparse
+import shutil
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from anonymizer.pseudonymizer import Pseudonymizer
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -26,63 +32,166 @@ ADDRESSES = ['Pine St', 'Maple Ave', 'Cedar Lane', 'Oak Blvd', 'Birch Rd', 'Spru
 START_DATE = datetime(1950, 1, 1)
 DATE_RANGE = (datetime(2005, 12, 31) - START_DATE).days
 
-# UDFs for data generation and anonymization
-@udf(StringType())
-def generate_first_name():
-    return random.choice(FIRST_NAMES)
+LETTERS = list(string.ascii_lowercase)
 
-@udf(StringType())
-def generate_last_name():
-    return random.choice(LAST_NAMES)
+# Generation and anonymization are built from Spark SQL expressions only, so
+# no value crosses to a Python worker. Random draws hash the seed, a stream
+# name and the row id with xxhash64, which keeps seeded values independent of
+# how the rows are partitioned.
+def _random_int(seed, stream, n):
+    """A column of integers in [0, n) for every row."""
+    return F.pmod(F.xxhash64(F.lit(seed), F.lit(stream), F.col("id")), F.lit(n))
 
-@udf(StringType())
-def generate_address():
-    return f"{random.randint(1, 999)} {random.choice(ADDRESSES)}"
+def _choice(seed, stream, values):
+    return F.element_at(F.array(*[F.lit(value) for value in values]), (_random_int(seed, stream, len(values)) + 1).cast("int"))
 
-@udf(StringType())
-def generate_date():
-    return (START_DATE + timedelta(days=random.randint(0, DATE_RANGE))).strftime('%d/%m/%Y')
+def _random_letters(seed, stream, k=5):
+    return F.concat(*[_choice(seed, f"{stream}/{i}", LETTERS) for i in range(k)])
 
-@udf(StringType())
-def anonymize_name(name):
-    return f"{name[0]}{''.join(random.choices(string.ascii_lowercase, k=5))}"
+# Java's \s with (?U) plus the separators \x1c-\x1f is the set str.split() splits on.
+_WHITESPACE = r"(?U)[\s\x1c-\x1f]+"
 
-@udf(StringType())
-def anonymize_address(address):
-    parts = address.split()
-    return f"{random.randint(1, 99)} {''.join(random.choices(string.ascii_lowercase, k=5))} {parts[-1]}"
+def _last_word(column):
+    """The last word of a string column, as value.split()[-1]."""
+    return F.element_at(F.split(F.regexp_replace(column, _WHITESPACE + "$", ""), _WHITESPACE), -1)
 
-def create_spark_session():
-    return (SparkSession.builder
-            .appName("DataProcessor")
+def create_spark_session(master=None):
+    builder = SparkSession.builder.appName("DataProcessor")
+    if master:
+        builder = builder.master(master)  # e.g. "local[*]" for tests
+    return (builder
             .config("spark.sql.shuffle.partitions", "100")  # Adjust based on your cluster
             .config("spark.default.parallelism", "100")    # Adjust based on your cluster
             .getOrCreate())
 
-def generate_data(spark, num_rows):
+def generate_data(spark, num_rows, seed=None):
+    seed = random.randrange(2 ** 31) if seed is None else seed
     return (spark.range(num_rows)
-            .withColumn("first_name", generate_first_name())
-            .withColumn("last_name", generate_last_name())
-            .withColumn("address", generate_address())
-            .withColumn("date_of_birth", generate_date()))
-
-def anonymize_data(df):
-    return (df.withColumn("first_name", anonymize_name(col("first_name")))
-            .withColumn("last_name", anonymize_name(col("last_name")))
-            .withColumn("address", anonymize_address(col("address"))))
-
-def process_data(spark, num_rows, output_file, anonymize=False):
-    df = generate_data(spark, num_rows)
-    
-    if anonymize:
-        df = anonymize_data(df)
-    
-    df.write.csv(output_file, header=True, mode="overwrite")
+            .withColumn("first_name", _choice(seed, "first_name", FIRST_NAMES))
+            .withColumn("last_name", _choice(seed, "last_name", LAST_NAMES))
+            .withColumn("address", F.concat((_random_int(seed, "house_number", 999) + 1).cast("string"),
+                                            F.lit(" "), _choice(seed, "street", ADDRESSES)))
+            .withColumn("date_of_birth", F.date_format(
+                F.date_add(F.lit(START_DATE.date()), _random_int(seed, "date_of_birth", DATE_RANGE + 1).cast("int")),
+                "dd/MM/yyyy")))
+
+def _hmac_sha256_hex(key, column):
+    """HMAC-SHA256 of a string column as hex, equal to Pseudonymizer.digest(value).hex()."""
+    if len(key) > 64:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(64, b"\0")
+    inner_pad = bytes(b ^ 0x36 for b in key).hex()
+    outer_pad = bytes(b ^ 0x5c for b in key).hex()
+    inner = F.unhex(F.sha2(F.concat(F.unhex(F.lit(inner_pad)), F.encode(column, "UTF-8")), 256))
+    return F.sha2(F.concat(F.unhex(F.lit(outer_pad)), inner), 256)
+
+def _digest_byte(digest, i):
+    return F.conv(F.substring(digest, 2 * i + 1, 2), 16, 10).cast("int")
+
+def _digest_letters(digest, k=5):
+    letters = F.array(*[F.lit(letter) for letter in LETTERS])
+    return F.concat(*[F.element_at(letters, F.pmod(_digest_byte(digest, i), F.lit(26)) + 1) for i in range(k)])
+
+def pseudonymize_name(pseudonymizer, column):
+    return F.concat(F.substring(column, 1, 1), _digest_letters(_hmac_sha256_hex(pseudonymizer.key, column)))
+
+def pseudonymize_address(pseudonymizer, column):
+    digest = _hmac_sha256_hex(pseudonymizer.key, column)
+    house_number = (F.pmod(_digest_byte(digest, 5), F.lit(99)) + 1).cast("string")
+    return F.concat_ws(" ", house_number, _digest_letters(digest), _last_word(column))
+
+def anonymize_data(df, pseudonymizer=None, seed=None):
+    if pseudonymizer:
+        return (df.withColumn("first_name", pseudonymize_name(pseudonymizer, F.col("first_name")))
+                .withColumn("last_name", pseudonymize_name(pseudonymizer, F.col("last_name")))
+                .withColumn("address", pseudonymize_address(pseudonymizer, F.col("address"))))
+    seed = random.randrange(2 ** 31) if seed is None else seed
+    address = F.concat_ws(" ", (_random_int(seed, "anonymized_house_number", 99) + 1).cast("string"),
+                          _random_letters(seed, "anonymized_street"), _last_word(F.col("address")))
+    return (df.withColumn("first_name", F.concat(F.substring("first_name", 1, 1),
+                                                 _random_letters(seed, "anonymized_first_name")))
+            .withColumn("last_name", F.concat(F.substring("last_name", 1, 1),
+                                              _random_letters(seed, "anonymized_last_name")))
+            .withColumn("address", address))
+
+def _records_per_file(df, target_file_bytes, sample_rows=1000):
+    """Estimates the rows per output file from the CSV size of a sample of rows."""
+    sample = df.limit(sample_rows).collect()
+    if not sample:
+        return 0
+    row_bytes = sum(len(",".join(str(value) for value in row).encode()) + 1 for row in sample) / len(sample)
+    return max(1, int(target_file_bytes / row_bytes))
+
+def write_csv(df, output_dir, partitions=None, target_file_bytes=None):
+    """
+    Writes a DataFrame as a directory of CSV part files with a header each.
+
+    `partitions` sets the number of part files (fewer partitions are coalesced,
+    more are repartitioned); `target_file_bytes` splits partitions into files of
+    about that size.
+    """
+    if partitions:
+        if partitions < df.rdd.getNumPartitions():
+            df = df.coalesce(partitions)
+        else:
+            df = df.repartition(partitions)
+    writer = df.write
+    if target_file_bytes:
+        writer = writer.option("maxRecordsPerFile", _records_per_file(df, target_file_bytes))
+    writer.csv(str(output_dir), header=True, mode="overwrite")
+
+def merge_part_files(output_dir, output_file):
+    """Concatenates the CSV part files of `output_dir` into `output_file`, keeping the first header."""
+    parts = sorted(Path(output_dir).glob("part-*.csv"))
+    with open(output_file, 'wb') as outfile:
+        for i, part in enumerate(parts):
+            with open(part, 'rb') as infile:
+                if i > 0:
+                    infile.readline()
+                shutil.copyfileobj(infile, outfile)
+
+def process_data(spark, num_rows, output_dir, pseudonymizer=None, seed=None, partitions=None,
+                 target_file_bytes=None, merge=False):
+    """
+    Generates mock data, writes it to `output_dir`/data and its anonymized copy to `output_dir`/anonymized.
+
+    The generated DataFrame is persisted and the anonymized one is derived from
+    it, so the data is only generated once. With `merge` the part files of each
+    output are also concatenated into data.csv and anonymized.csv.
+
+    Returns:
+        Tuple[float, float]: The generation and anonymization times in seconds.
+    """
+    output_dir = Path(output_dir)
+    df = generate_data(spark, num_rows, seed).persist(StorageLevel.MEMORY_AND_DISK)
+    try:
+        start_time = time.time()
+        write_csv(df, output_dir / 'data', partitions, target_file_bytes)
+        if merge:
+            merge_part_files(output_dir / 'data', output_dir / 'data.csv')
+        gen_time = time.time() - start_time
+
+        start_time = time.time()
+        write_csv(anonymize_data(df, pseudonymizer, seed), output_dir / 'anonymized', partitions, target_file_bytes)
+        if merge:
+            merge_part_files(output_dir / 'anonymized', output_dir / 'anonymized.csv')
+        anon_time = time.time() - start_time
+    finally:
+        df.unpersist()
+    return gen_time, anon_time
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Generate and anonymize mock data using PySpark")
     parser.add_argument('--num_rows', type=int, default=20_000_000, help='Number of rows to generate')
     parser.add_argument('--output_dir', type=str, default='./output', help='Directory to save the output files')
+    parser.add_argument('--key', type=str, default=None,
+                        help='Secret key for deterministic pseudonyms; random values are used when omitted')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for reproducible generation and anonymization')
+    parser.add_argument('--partitions', type=int, default=None,
+                        help='Number of output part files; the partitioning of the data when omitted')
+    parser.add_argument('--target_file_mb', type=int, default=None, help='Approximate size of each output part file')
+    parser.add_argument('--merge', action='store_true',
+                        help='Also merge the part files of each output into a single CSV file')
     return parser.parse_args()
 
 def main():
@@ -92,25 +201,14 @@ def main():
         output_dir = Path(args.output_dir)
         output_dir.mkdir(exist_ok=True)
 
-        mock_data_file = str(output_dir / 'data')
-        anonymized_file = str(output_dir / 'anonymized')
-
-        num_rows = args.num_rows
-
         spark = create_spark_session()
 
-        # Generate mock data
-        start_time = time.time()
-        process_data(spark, num_rows, mock_data_file)
-        gen_time = time.time() - start_time
+        pseudonymizer = Pseudonymizer(args.key) if args.key else None
+        target_file_bytes = args.target_file_mb * 1024 * 1024 if args.target_file_mb else None
+        gen_time, anon_time = process_data(spark, args.num_rows, output_dir, pseudonymizer, args.seed,
+                                           args.partitions, target_file_bytes, args.merge)
         logging.info(f"Data generation completed in {gen_time:.2f} seconds")
-
-        # Anonymize data
-        start_time = time.time()
-        process_data(spark, num_rows, anonymized_file, anonymize=True)
-        anon_time = time.time() - start_time
         logging.info(f"Data anonymization completed in {anon_time:.2f} seconds")
-
         logging.info(f"Total processing time: {gen_time + anon_time:.2f} seconds")
 
         spark.stop()
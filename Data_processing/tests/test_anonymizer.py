@@ -42,5 +42,35 @@ class TestAnonymizer(unittest.TestCase):
         self.assertNotEqual(data[0]['address'], '123 Main St')
         self.assertEqual(data[0]['date_of_birth'], '01/01/1990')
 
+    def test_anonymize_data_in_batches(self):
+        fields_to_anonymize = ['first_name', 'last_name', 'address']
+        progress = []
+        anonymizer = Anonymizer(self.input_file, self.output_file, fields_to_anonymize, batch_size=1,
+                                progress_callback=lambda stats: progress.append(stats.rows))
+        stats = anonymizer.anonymize_data()
+
+        self.assertEqual(stats.rows, 2)
+        self.assertEqual(stats.batches, 2)
+        self.assertEqual(progress, [1, 2])
+
+        with open(self.output_file, 'r', newline='') as csvfile:
+            reader = csv.DictReader(csvfile)
+            data = list(reader)
+
+        self.assertEqual(reader.fieldnames, ['first_name', 'last_name', 'address', 'date_of_birth'])
+        self.assertEqual(len(data), 2)
+        self.assertTrue(data[1]['first_name'].startswith('J'))
+        self.assertTrue(data[1]['address'].endswith(' St'))
+        self.assertEqual(data[1]['date_of_birth'], '02/02/1980')
+
+    def test_seed_is_reproducible(self):
+        fields_to_anonymize = ['first_name', 'last_name', 'address']
+        outputs = []
+        for _ in range(2):
+            Anonymizer(self.input_file, self.output_file, fields_to_anonymize, seed=42).anonymize_data()
+            with open(self.output_file, 'r', newline='') as csvfile:
+                outputs.append(csvfile.read())
+        self.assertEqual(outputs[0], outputs[1])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import unittest
+from anonymizerscale.anonymizer import Anonymizer
+from pathlib import Path
+import csv
+import os
+
+class TestScaleAnonymizer(unittest.TestCase):
+
+    def setUp(self):
+        # Create a sample input file
+        self.input_file = Path('test_scale_input.csv')
+        self.output_file = Path('test_scale_output.csv')
+        self.rows = [
+            {'first_name': 'John', 'last_name': 'Doe', 'address': '123 Main St', 'date_of_birth': '01/01/1990'},
+            {'first_name': 'Jane', 'last_name': 'Smith', 'address': '456 "Old"\nOak St', 'date_of_birth': '02/02/1980'},
+            {'first_name': 'Mia', 'last_name': 'Lee', 'address': '7 Elm, Ave', 'date_of_birth': '03/03/1970'},
+        ] * 5
+        with open(self.input_file, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=['first_name', 'last_name', 'address', 'date_of_birth'])
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def tearDown(self):
+        # Clean up the files after test
+        if os.path.exists(self.input_file):
+            os.remove(self.input_file)
+        if os.path.exists(self.output_file):
+            os.remove(self.output_file)
+
+    def test_anonymize_data_keeps_order(self):
+        anonymizer = Anonymizer(self.input_file, self.output_file, chunk_size=2, processes=2,
+                                max_pending_chunks=2, strategy='pipeline')
+        anonymizer.anonymize_data()
+        self._assert_anonymized()
+
+    def test_anonymize_data_raises_worker_errors(self):
+        with open(self.input_file, 'wb') as f:
+            f.write(b'first_name,last_name,address,date_of_birth\n')
+            f.write(b'J\xf6rg,Doe,123 Main St,01/01/1990\n')
+            f.write(b'John,Doe,123 Main St,01/01/1990\n' * 2000)
+        for strategy in Anonymizer.STRATEGIES:
+            with self.subTest(strategy=strategy):
+                anonymizer = Anonymizer(self.input_file, self.output_file, chunk_size=10, processes=2,
+                                        max_pending_chunks=2, strategy=strategy, chunk_bytes=64)
+                with self.assertRaises(UnicodeDecodeError):
+                    anonymizer.anonymize_data()
+
+    def test_anonymize_data_byte_ranges(self):
+        anonymizer = Anonymizer(self.input_file, self.output_file, processes=2, chunk_bytes=64)
+        anonymizer.anonymize_data()
+        self._assert_anonymized()
+
+    def test_anonymize_data_byte_ranges_keeps_record_count(self):
+        rows = [
+            {'first_name': f'Name{i}', 'last_name': 'Doe',
+             'address': f'{i} "Main"\nSt' if i % 7 == 0 else f'{i} Main St', 'date_of_birth': '01/01/1990'}
+            for i in range(5000)
+        ]
+        with open(self.input_file, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        for chunk_bytes in (997, 1024 * 1024):
+            with self.subTest(chunk_bytes=chunk_bytes):
+                Anonymizer(self.input_file, self.output_file, processes=2, chunk_bytes=chunk_bytes).anonymize_data()
+                with open(self.output_file, 'r', newline='') as csvfile:
+                    data = list(csv.DictReader(csvfile))
+                self.assertEqual(len(data), len(rows))
+                self.assertEqual([row['date_of_birth'] for row in data], [row['date_of_birth'] for row in rows])
+
+    def test_split_ranges_respects_quoted_newlines(self):
+        anonymizer = Anonymizer(self.input_file, self.output_file, chunk_bytes=16)
+        with open(self.input_file, 'rb') as f:
+            start = len(f.readline())
+            data = f.read()
+        for parts in (1, 3, 8, 100):
+            with self.subTest(parts=parts):
+                ranges = anonymizer._split_ranges(start, parts)
+                self.assertEqual(ranges[0][0], start)
+                self.assertEqual(ranges[-1][1], start + len(data))
+                rows = []
+                for lo, hi in ranges:
+                    chunk = data[lo - start:hi - start].decode()
+                    rows.extend(csv.DictReader(chunk.splitlines(keepends=True), fieldnames=list(self.rows[0])))
+                self.assertEqual(rows, self.rows)
+
+    def test_seed_is_reproducible_across_process_counts(self):
+        for strategy in Anonymizer.STRATEGIES:
+            with self.subTest(strategy=strategy):
+                outputs = []
+                for processes in (1, 3):
+                    Anonymizer(self.input_file, self.output_file, chunk_size=4, processes=processes,
+                               strategy=strategy, chunk_bytes=100, seed=42).anonymize_data()
+                    outputs.append(self.output_file.read_bytes())
+                self.assertEqual(outputs[0], outputs[1])
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            Anonymizer(self.input_file, self.output_file, strategy='threads')
+
+    def _assert_anonymized(self):
+        with open(self.output_file, 'r', newline='') as csvfile:
+            data = list(csv.DictReader(csvfile))
+
+        self.assertEqual(len(data), len(self.rows))
+        for original, anonymized in zip(self.rows, data):
+            self.assertEqual(anonymized['date_of_birth'], original['date_of_birth'])
+            self.assertEqual(anonymized['first_name'][0], original['first_name'][0])
+            self.assertNotEqual(anonymized['first_name'], original['first_name'])
+            self.assertEqual(anonymized['address'].split()[-1], original['address'].split()[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,9 @@ import time
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Fixed so timings of different runs are measured on the same data.
+SEED = 42
+
 def main():
     try:
         output_dir = Path('./output')
@@ -20,14 +23,14 @@ def main():
         # Generate mock data (approximately 2GB)
         num_rows = 20_000_000  # Adjust this number to achieve desired file size
         start_time = time.time()
-        generator = MockDataGenerator(num_rows=num_rows, output_file=mock_data_file)
+        generator = MockDataGenerator(num_rows=num_rows, output_file=mock_data_file, mode='columnar', seed=SEED)
         generator.generate_mock_data()
         gen_time = time.time() - start_time
         logging.info(f"Data generation completed in {gen_time:.2f} seconds")
 
         # Anonymize data
         start_time = time.time()
-        anonymizer = Anonymizer(input_file=mock_data_file, output_file=anonymized_file)
+        anonymizer = Anonymizer(input_file=mock_data_file, output_file=anonymized_file, seed=SEED)
         anonymizer.anonymize_data()
         anon_time = time.time() - start_time
         logging.info(f"Data anonymization completed in {anon_time:.2f} seconds")
@@ -38,5 +38,31 @@ class TestMockDataGenerator(unittest.TestCase):
             self.assertTrue(row['address'])
             self.assertTrue(row['date_of_birth'])
 
+    def test_generate_columnar_mock_data(self):
+        num_rows = 25
+        generator = MockDataGenerator(num_rows, self.output_file, fields=['first_name', 'date_of_birth'],
+                                      mode='columnar', block_size=10)
+        generator.generate_mock_data()
+
+        with open(self.output_file, 'r', newline='') as csvfile:
+            reader = csv.DictReader(csvfile)
+            data = list(reader)
+
+        self.assertEqual(reader.fieldnames, ['first_name', 'date_of_birth'])
+        self.assertEqual(len(data), num_rows)
+        for row in data:
+            self.assertIn(row['first_name'], MockDataGenerator.FIRST_NAMES)
+            self.assertRegex(row['date_of_birth'], r'^\d\d/\d\d/(19[5-9]\d|200[0-5])$')
+
+    def test_seed_is_reproducible(self):
+        for mode in MockDataGenerator.MODES:
+            with self.subTest(mode=mode):
+                outputs = []
+                for _ in range(2):
+                    MockDataGenerator(20, self.output_file, mode=mode, seed=42).generate_mock_data()
+                    with open(self.output_file, 'r', newline='') as csvfile:
+                        outputs.append(csvfile.read())
+                self.assertEqual(outputs[0], outputs[1])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import unittest
+import pickle
+import re
+from anonymizer.anonymizer import Anonymizer
+from anonymizer.pseudonymizer import Pseudonymizer
+from anonymizerscale.anonymizer import Anonymizer as ScaleAnonymizer
+from pathlib import Path
+import csv
+
+class TestPseudonymizer(unittest.TestCase):
+
+    def setUp(self):
+        self.input_file = Path('test_pseudonym_input.csv')
+        self.output_file = Path('test_pseudonym_output.csv')
+        self.scale_output_file = Path('test_pseudonym_scale_output.csv')
+        with open(self.input_file, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=['first_name', 'last_name', 'address', 'date_of_birth'])
+            writer.writeheader()
+            writer.writerow({'first_name': 'John', 'last_name': 'Doe', 'address': '123 Main St', 'date_of_birth': '01/01/1990'})
+            writer.writerow({'first_name': 'Jane', 'last_name': 'Doe', 'address': '456 Oak St', 'date_of_birth': '02/02/1980'})
+            writer.writerow({'first_name': 'John', 'last_name': 'Smith', 'address': '123 Main St', 'date_of_birth': '03/03/1970'})
+
+    def tearDown(self):
+        for path in (self.input_file, self.output_file, self.scale_output_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_pseudonyms_are_deterministic(self):
+        first, second = Pseudonymizer('secret'), Pseudonymizer(b'secret')
+        self.assertEqual(first.name('John'), second.name('John'))
+        self.assertEqual(first.address('123 Main St'), second.address('123 Main St'))
+        self.assertNotEqual(first.name('John'), Pseudonymizer('other').name('John'))
+
+        restored = pickle.loads(pickle.dumps(first))
+        self.assertEqual(restored.name('John'), first.name('John'))
+
+    def test_pseudonym_shape(self):
+        pseudonymizer = Pseudonymizer('secret')
+        self.assertRegex(pseudonymizer.name('John'), re.compile(r'^J[a-z]{5}$'))
+        self.assertRegex(pseudonymizer.address('123 Main St'), re.compile(r'^([1-9]|[1-9][0-9]) [a-z]{5} St$'))
+
+    def test_pseudonyms_are_cached(self):
+        pseudonymizer = Pseudonymizer('secret', cache_size=2)
+        for name in ['John', 'Jane', 'John', 'John']:
+            pseudonymizer.name(name)
+        info = pseudonymizer.name.cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize), (2, 2, 2))
+
+    def test_anonymizers_agree(self):
+        fields_to_anonymize = ['first_name', 'last_name', 'address']
+        Anonymizer(self.input_file, self.output_file, fields_to_anonymize,
+                   pseudonymizer=Pseudonymizer('secret')).anonymize_data()
+        ScaleAnonymizer(self.input_file, self.scale_output_file, processes=2,
+                        pseudonymizer=Pseudonymizer('secret')).anonymize_data()
+
+        with open(self.output_file, 'r', newline='') as csvfile:
+            data = list(csv.DictReader(csvfile))
+        with open(self.scale_output_file, 'r', newline='') as csvfile:
+            scale_data = list(csv.DictReader(csvfile))
+
+        self.assertEqual(data, scale_data)
+        self.assertEqual(data[0]['first_name'], data[2]['first_name'])
+        self.assertEqual(data[0]['last_name'], data[1]['last_name'])
+        self.assertEqual(data[0]['address'], data[2]['address'])
+        self.assertNotEqual(data[0]['first_name'], 'John')
+
+if __name__ == '__main__':
+    unittest.main()
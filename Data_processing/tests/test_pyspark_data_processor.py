@@ -0,0 +1,106 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import unittest
+import re
+import csv
+import tempfile
+from pathlib import Path
+from anonymizer.pseudonymizer import Pseudonymizer
+from anonymizer.rules import AnonymizationRules
+
+try:
+    import pyspark
+except ImportError:
+    pyspark = None
+
+@unittest.skipIf(pyspark is None, "pyspark is not installed")
+class TestPySparkDataProcessor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from tests import pyspark_data_processor
+        cls.processor = pyspark_data_processor
+        try:
+            cls.spark = pyspark_data_processor.create_spark_session("local[*]")
+        except Exception as e:
+            # pyspark is installed but cannot start a JVM, e.g. without Java.
+            raise unittest.SkipTest(f"Spark session cannot start: {e}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.spark.stop()
+
+    def test_generate_data(self):
+        rows = self.processor.generate_data(self.spark, 200, seed=42).collect()
+        self.assertEqual(len(rows), 200)
+        for row in rows:
+            self.assertIn(row.first_name, self.processor.FIRST_NAMES)
+            self.assertIn(row.last_name, self.processor.LAST_NAMES)
+            self.assertRegex(row.address, r'^\d{1,3} ')
+            self.assertIn(row.address.split(' ', 1)[1], self.processor.ADDRESSES)
+            self.assertRegex(row.date_of_birth, r'^\d\d/\d\d/(19[5-9]\d|200[0-5])$')
+
+    def test_seed_is_independent_of_partitioning(self):
+        df = self.processor.generate_data(self.spark, 200, seed=42)
+        repartitioned = self.processor.generate_data(self.spark, 200, seed=42).repartition(7)
+        self.assertEqual(sorted(df.collect()), sorted(repartitioned.collect()))
+
+    def test_anonymize_data(self):
+        df = self.processor.generate_data(self.spark, 100, seed=42)
+        for original, anonymized in zip(df.collect(), self.processor.anonymize_data(df, seed=1).collect()):
+            self.assertRegex(anonymized.first_name, re.compile(f'^{original.first_name[0]}[a-z]{{5}}$'))
+            self.assertRegex(anonymized.address, r'^\d{1,2} [a-z]{5} \w+$')
+            self.assertEqual(anonymized.address.split()[-1], original.address.split()[-1])
+            self.assertEqual(anonymized.date_of_birth, original.date_of_birth)
+
+    def test_pseudonyms_match_pseudonymizer(self):
+        pseudonymizer = Pseudonymizer('secret')
+        df = self.processor.generate_data(self.spark, 100, seed=42)
+        anonymized = self.processor.anonymize_data(df, pseudonymizer).collect()
+        for original, row in zip(df.collect(), anonymized):
+            self.assertEqual(row.first_name, pseudonymizer.name(original.first_name))
+            self.assertEqual(row.last_name, pseudonymizer.name(original.last_name))
+            self.assertEqual(row.address, pseudonymizer.address(original.address))
+
+    def test_last_word_matches_python_split(self):
+        addresses = ['12  Pine St', ' 7 Oak Blvd ', '3\tFir\tDr\t', '5 Elm\u00a0Ave\n', '9 Ash\u3000Ln\x1f', 'Cedar']
+        df = self.spark.createDataFrame(
+            [(i, 'Ann', 'Lee', address, '01/01/2000') for i, address in enumerate(addresses)],
+            ['id', 'first_name', 'last_name', 'address', 'date_of_birth'])
+        pseudonymizer = Pseudonymizer('secret')
+        rules = AnonymizationRules.from_fields(['address']).compile(['address'])
+        random_rows = self.processor.anonymize_data(df, seed=1).collect()
+        pseudonym_rows = self.processor.anonymize_data(df, pseudonymizer).collect()
+        for address, random_row, pseudonym_row in zip(addresses, random_rows, pseudonym_rows):
+            with self.subTest(address=address):
+                self.assertEqual(random_row.address.split()[-1], address.split()[-1])
+                self.assertEqual(pseudonym_row.address, pseudonymizer.address(address))
+                self.assertEqual(rules.apply([address])[0].split()[-1], address.split()[-1])
+
+    def test_process_data_merges_part_files(self):
+        output_dir = Path(tempfile.mkdtemp())
+        self.processor.process_data(self.spark, 300, output_dir, seed=42, partitions=3, merge=True)
+        self.assertEqual(len(list((output_dir / 'data').glob('part-*.csv'))), 3)
+
+        with open(output_dir / 'data.csv', newline='') as f:
+            data = list(csv.DictReader(f))
+        with open(output_dir / 'anonymized.csv', newline='') as f:
+            anonymized = {row['id']: row for row in csv.DictReader(f)}
+        self.assertEqual(sorted(int(row['id']) for row in data), list(range(300)))
+        self.assertEqual(len(anonymized), 300)
+        for row in data:
+            self.assertEqual(anonymized[row['id']]['date_of_birth'], row['date_of_birth'])
+            self.assertEqual(anonymized[row['id']]['first_name'][0], row['first_name'][0])
+
+    def test_write_csv_target_file_size(self):
+        output_dir = Path(tempfile.mkdtemp()) / 'data'
+        df = self.processor.generate_data(self.spark, 1000, seed=42)
+        self.processor.write_csv(df, output_dir, partitions=1, target_file_bytes=10_000)
+        parts = list(output_dir.glob('part-*.csv'))
+        self.assertGreater(len(parts), 1)
+        for part in parts:
+            self.assertLess(part.stat().st_size, 15_000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import unittest
+import json
+import tempfile
+from anonymizer.anonymizer import Anonymizer
+from anonymizer.rules import AnonymizationRules
+from anonymizerscale.anonymizer import Anonymizer as ScaleAnonymizer
+from pathlib import Path
+import csv
+
+class TestRules(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.input_file = self.temp_dir / 'input.csv'
+        self.rules_file = self.temp_dir / 'rules.json'
+        with open(self.input_file, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['id', 'first_name', 'email', 'ssn', 'age', 'date_of_birth'])
+            writer.writerow(['1', 'John', 'john@example.com', '123-45-6789', '37', '15/06/1990'])
+            writer.writerow(['2', 'Jane', 'jane@example.com', '987-65-4321', '42', '01/01/1980'])
+        with open(self.rules_file, 'w') as f:
+            json.dump({"columns": {
+                "first_name": {"strategy": "pseudonym", "kind": "name"},
+                "email": {"strategy": "hash", "length": 12},
+                "ssn": "drop",
+                "age": {"strategy": "generalize", "bucket": 10},
+                "date_of_birth": {"strategy": "date_shift", "days": 10},
+                "phone": "mask",
+            }}, f)
+
+    def test_compile(self):
+        rules = AnonymizationRules({"ssn": "drop", "name": {"strategy": "mask", "keep": 2}})
+        compiled = rules.compile(['id', 'ssn', 'name'])
+        self.assertEqual(compiled.fieldnames, ['id', 'name'])
+        self.assertEqual([position for position, _ in compiled.table], [0, 2])
+        self.assertEqual(compiled.apply(('7', '123', 'Alice')), ['7', 'Al***'])
+
+    def test_generalize_date(self):
+        rules = AnonymizationRules({"date_of_birth": "generalize"})
+        self.assertEqual(rules.compile(['date_of_birth']).apply(['15/06/1990']), ['1990'])
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            AnonymizationRules({"name": "scramble"}).compile(['name'])
+
+    def test_missing_strategy(self):
+        with self.assertRaisesRegex(ValueError, 'Missing strategy for column name'):
+            AnonymizationRules({"name": {"keep": 2}}).compile(['name'])
+
+    def test_hash_requires_key(self):
+        with self.assertRaisesRegex(ValueError, 'requires a key'):
+            AnonymizationRules.load(self.rules_file)
+
+    def test_short_row(self):
+        compiled = AnonymizationRules({"name": "mask"}).compile(['id', 'name'])
+        with self.assertRaisesRegex(ValueError, 'Expected at least 2 values, got 1'):
+            compiled.apply(['7'])
+
+    def test_anonymizers_skip_blank_lines(self):
+        with open(self.input_file, 'a', newline='') as csvfile:
+            csvfile.write('\r\n\n')
+        rules = AnonymizationRules.load(self.rules_file, key='secret')
+        anonymizers = {
+            'anonymizer': Anonymizer(self.input_file, self.temp_dir / 'output.csv', [], rules=rules),
+            'ranges': ScaleAnonymizer(self.input_file, self.temp_dir / 'ranges.csv', processes=2, rules=rules),
+            'pipeline': ScaleAnonymizer(self.input_file, self.temp_dir / 'pipeline.csv', processes=2,
+                                        rules=rules, strategy='pipeline'),
+        }
+        for name, anonymizer in anonymizers.items():
+            with self.subTest(anonymizer=name):
+                anonymizer.anonymize_data()
+                with open(anonymizer.output_file, 'r', newline='') as csvfile:
+                    self.assertEqual([row['id'] for row in csv.DictReader(csvfile)], ['1', '2'])
+
+    def test_anonymizers_apply_rules(self):
+        rules = AnonymizationRules.load(self.rules_file, key='secret')
+        output_file = self.temp_dir / 'output.csv'
+        scale_output_file = self.temp_dir / 'scale_output.csv'
+        Anonymizer(self.input_file, output_file, [], rules=rules).anonymize_data()
+        ScaleAnonymizer(self.input_file, scale_output_file, processes=2, rules=rules).anonymize_data()
+
+        with open(output_file, 'r', newline='') as csvfile:
+            reader = csv.DictReader(csvfile)
+            data = list(reader)
+        with open(scale_output_file, 'r', newline='') as csvfile:
+            self.assertEqual(list(csv.DictReader(csvfile)), data)
+
+        self.assertEqual(reader.fieldnames, ['id', 'first_name', 'email', 'age', 'date_of_birth'])
+        self.assertEqual(data[0]['id'], '1')
+        self.assertRegex(data[0]['first_name'], r'^J[a-z]{5}$')
+        self.assertRegex(data[0]['email'], r'^[0-9a-f]{12}$')
+        self.assertEqual([row['age'] for row in data], ['30-39', '40-49'])
+        self.assertRegex(data[0]['date_of_birth'], r'^\d\d/0[56]/1990$')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+import unittest
+import tempfile
+from anonymizerscale.generator import MockDataGenerator
+from pathlib import Path
+import csv
+
+class TestScaleMockDataGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def _generate(self, name, **kwargs):
+        output_file = self.temp_dir / name
+        MockDataGenerator(num_rows=25, output_file=output_file, chunk_size=10, **kwargs).generate_mock_data()
+        return output_file.read_bytes()
+
+    def test_generate_mock_data(self):
+        for mode in MockDataGenerator.MODES:
+            with self.subTest(mode=mode):
+                data = self._generate(f'{mode}.csv', mode=mode, processes=2)
+                reader = csv.DictReader(data.decode().splitlines())
+                rows = list(reader)
+                self.assertEqual(reader.fieldnames, ['first_name', 'last_name', 'address', 'date_of_birth'])
+                self.assertEqual(len(rows), 25)
+                self.assertTrue(all(row['first_name'] in MockDataGenerator.FIRST_NAMES for row in rows))
+
+    def test_seed_is_reproducible_across_process_counts(self):
+        for mode in MockDataGenerator.MODES:
+            with self.subTest(mode=mode):
+                first = self._generate('first.csv', mode=mode, seed=42, processes=1)
+                second = self._generate('second.csv', mode=mode, seed=42, processes=3)
+                other = self._generate('other.csv', mode=mode, seed=7, processes=1)
+                self.assertEqual(first, second)
+                self.assertNotEqual(first, other)
+
+if __name__ == '__main__':
+    unittest.main()
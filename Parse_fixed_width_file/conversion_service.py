@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import pathlib
+import sys
+import os
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_processor.service import ConversionService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def parse_args() -> argparse.Namespace:
+    """Parse user command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Converts Fixed width files to CSV in a long-running process.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--watch_dir", type=pathlib.Path, default=None, help="Directory of Fixed width files to convert"
+    )
+    parser.add_argument(
+        "--spec_file", type=pathlib.Path, default=None, help="Fixed width and CSV spec file path of --watch_dir"
+    )
+    parser.add_argument(
+        "--output_dir", type=pathlib.Path, default=None, help="Directory of the files converted from --watch_dir"
+    )
+    parser.add_argument("--pattern", default="*.fwf", help="Glob of the files to convert in --watch_dir")
+    parser.add_argument("--poll_interval", type=float, default=1.0, help="Seconds between --watch_dir scans")
+    parser.add_argument(
+        "--format", choices=["csv", "arrow", "parquet"], default="csv", help="Output format of --watch_dir"
+    )
+    parser.add_argument(
+        "--engine", choices=["text", "mmap"], default="text", help="Fixed width parsing engine of --watch_dir"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address of the request socket")
+    parser.add_argument(
+        "--port", type=int, default=None,
+        help="Port of the request socket, which takes one JSON request per line; no socket when omitted",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    args = parser.parse_args()
+    if args.watch_dir is None and args.port is None:
+        parser.error("--watch_dir or --port is required")
+    if args.watch_dir is not None and (args.spec_file is None or args.output_dir is None):
+        parser.error("--watch_dir requires --spec_file and --output_dir")
+    return args
+
+async def serve(args: argparse.Namespace) -> None:
+    async with ConversionService(args.workers) as service:
+        tasks = []
+        if args.port is not None:
+            server = await service.start_server(args.host, args.port)
+            logger.info(f"Listening on {', '.join(str(s.getsockname()) for s in server.sockets)}")
+            tasks.append(asyncio.create_task(server.serve_forever()))
+        if args.watch_dir is not None:
+            logger.info(f"Watching {args.watch_dir}")
+            tasks.append(asyncio.create_task(service.watch(
+                args.watch_dir, args.spec_file, args.output_dir, args.format, args.engine,
+                args.pattern, args.poll_interval,
+            )))
+        await asyncio.gather(*tasks)
+
+def main() -> int:
+    args = parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logger.error(f"Conversion service failed: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
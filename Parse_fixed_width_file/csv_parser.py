@@ -6,7 +6,10 @@ import os
 import logging
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
-from data_processor.data_processor import write_csv_file, parse_fwf_file, load_csv_spec_file, load_fwf_spec_file
+from data_processor.data_processor import (
+    load_csv_spec_file, load_fwf_spec_file, convert_fwf_file_parallel, parse_fwf_batches,
+    parse_fwf_predicate, select_csv_columns, select_fwf_columns, write_batches
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,17 +27,67 @@ def parse_args() -> argparse.Namespace:
         "--fwf_file", type=pathlib.Path, required=True, help="Fixed width data file path"
     )
     parser.add_argument(
-        "--csv_file", type=pathlib.Path, required=True, help="Generated CSV file path"
+        "--csv_file", type=pathlib.Path, required=True, help="Generated CSV (or --format) file path"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--engine", choices=["text", "mmap", "spark"], default="text",
+        help="Fixed width parsing engine; spark requires pyspark and writes a directory of part files",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of worker processes; more than 1 converts byte ranges of the file in parallel",
+    )
+    parser.add_argument(
+        "--columns", type=lambda value: value.split(","), default=None,
+        help="Comma separated list of columns to write",
+    )
+    parser.add_argument(
+        "--where", type=parse_fwf_predicate, action="append", default=None,
+        help="Row filter as col=value, col^=prefix, col>=low or col<=high; may be repeated",
+    )
+    parser.add_argument(
+        "--format", choices=["csv", "arrow", "parquet"], default="csv",
+        help="Output format; arrow and parquet require pyarrow and keep typed columns",
+    )
+    parser.add_argument(
+        "--row_group_size", type=int, default=100000, help="Rows per batch and Parquet row group"
+    )
+    args = parser.parse_args()
+    if args.workers > 1 and args.format != "csv":
+        parser.error("--workers is only supported with --format csv")
+    if args.engine == "spark" and (args.workers > 1 or args.where or args.format == "arrow"):
+        parser.error("--engine spark does not support --workers, --where or --format arrow")
+    return args
 
 def main() -> int:
     args = parse_args()
     try:
         fwf_spec = load_fwf_spec_file(args.spec_file)
-        csv_spec = load_csv_spec_file(args.spec_file)
-        fwf_lines = parse_fwf_file(fwf_spec, args.fwf_file)
-        write_csv_file(csv_spec, fwf_lines, args.csv_file)
+        csv_spec = select_csv_columns(fwf_spec, load_csv_spec_file(args.spec_file), args.columns)
+        if args.engine == "spark":
+            from pyspark.sql import SparkSession
+            from data_processor.spark_reader import convert_fwf_file_spark
+
+            spark = SparkSession.builder.appName("FWFParser").getOrCreate()
+            try:
+                convert_fwf_file_spark(
+                    spark, fwf_spec, csv_spec, args.fwf_file, args.csv_file, args.format, args.columns
+                )
+            finally:
+                spark.stop()
+        elif args.workers > 1:
+            convert_fwf_file_parallel(
+                fwf_spec, csv_spec, args.fwf_file, args.csv_file, args.workers, args.columns, args.where
+            )
+        else:
+            batches = parse_fwf_batches(
+                fwf_spec, args.fwf_file, args.engine, typed=args.format != "csv",
+                batch_size=args.row_group_size, columns=args.columns, where=args.where,
+            )
+            write_batches(
+                args.format, csv_spec, batches, args.csv_file, args.row_group_size,
+                select_fwf_columns(fwf_spec, args.columns),
+            )
     except Exception as e:
         logger.error(f"Failed to generate CSV file: {e}")
         return 1  # Return 1 for failure
@@ -2,12 +2,23 @@ import csv
 import pathlib
 import codecs
 import dataclasses
+import datetime
+import decimal
+import functools
+import io
 import json
+import mmap
+import multiprocessing as mp
+import os
 import random as rnd
+import re
+import shutil
 import string
+import struct
 import logging
-from itertools import accumulate, chain
-from typing import Any, Callable, Iterator, ClassVar, List
+import tempfile
+from itertools import accumulate, chain, islice
+from typing import Any, Callable, Dict, Iterator, ClassVar, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +29,7 @@ class FWFColumnSpec:
     offset: int
     length: int
     dtype: str = "str"
+    fmt: Optional[str] = None
 
 @dataclasses.dataclass
 class FWFSpec:
@@ -26,6 +38,24 @@ class FWFSpec:
     header: bool
     encoding: str
 
+@dataclasses.dataclass
+class FWFPredicate:
+    """Row filter on the stripped raw value of a fixed width column.
+
+    `op` is "eq" or "prefix" against `value`, or "range" between the inclusive
+    bounds `value` and `high`, either of which may be None. Ranges on int,
+    float, decimal and date columns compare the converted values, so empty
+    values never match.
+    """
+    column: str
+    op: str
+    value: Optional[str] = None
+    high: Optional[str] = None
+
+# Batches exchanged between parsers, transforms and writers: one buffer of
+# values per column, all buffers of the same length.
+ColumnBatch = List[Sequence[Any]]
+
 @dataclasses.dataclass
 class CSVSpec:
     """CSV file specification"""
@@ -41,8 +71,32 @@ def _rnd_str(length=1) -> str:
 def _rnd_fwf_str(column_spec: FWFColumnSpec) -> str:
     return _rnd_str(column_spec.length)
 
+def _rnd_fwf_int(column_spec: FWFColumnSpec) -> str:
+    return str(rnd.randrange(10 ** column_spec.length)).rjust(column_spec.length)
+
+def _rnd_fwf_float(column_spec: FWFColumnSpec) -> str:
+    fmt = column_spec.fmt or ".2f"
+    int_digits = column_spec.length - len(format(0, fmt)) + 1
+    if int_digits < 1:
+        raise ValueError(f"Column {column_spec.name} is too short for format {fmt}")
+    return format(rnd.uniform(0, 10 ** int_digits - 1), fmt).rjust(column_spec.length)
+
+_RND_DATE_START = datetime.date(1970, 1, 1)
+_RND_DATE_DAYS = (datetime.date(2037, 12, 31) - _RND_DATE_START).days
+
+def _rnd_fwf_date(column_spec: FWFColumnSpec) -> str:
+    value = _RND_DATE_START + datetime.timedelta(days=rnd.randrange(_RND_DATE_DAYS))
+    value = value.strftime(column_spec.fmt or "%Y-%m-%d")
+    if len(value) > column_spec.length:
+        raise ValueError(f"Column {column_spec.name} is too short for format {column_spec.fmt}")
+    return value.ljust(column_spec.length)
+
 _RND_VALUES_GENERATOR_BY_TYPE = {
     "str": _rnd_fwf_str,
+    "int": _rnd_fwf_int,
+    "float": _rnd_fwf_float,
+    "decimal": _rnd_fwf_float,
+    "date": _rnd_fwf_date,
 }
 
 def _unexpected_data_type(column_spec: FWFColumnSpec):
@@ -93,26 +147,40 @@ def load_fwf_spec_file(spec_path: pathlib.Path) -> FWFSpec:
         raise
 
 def load_fwf_spec_json(spec_json: str) -> FWFSpec:
+    """Loads a FWF spec; the JSON is parsed and validated once per distinct text."""
     try:
-        data = json.loads(spec_json)
-        column_names = data.get("ColumnNames")
-        header = data.get("IncludeHeader")
-        encoding = data.get("FixedWidthEncoding")
-        column_lengths = data.get("Offsets")
+        columns, header, encoding = _load_fwf_spec_key(spec_json)
+        return FWFSpec(header=header, encoding=encoding, columns=[FWFColumnSpec(*col) for col in columns])
+    except Exception as e:
+        logger.error(f"Error loading FWF spec JSON: {e}")
+        raise
 
-        validate_encoding(encoding)
+@functools.lru_cache(maxsize=256)
+def _load_fwf_spec_key(spec_json: str) -> Tuple[Tuple[Tuple[Any, ...], ...], bool, str]:
+    """Parses a FWF spec JSON into the content key of `_fwf_spec_key`."""
+    data = json.loads(spec_json)
+    column_names = data.get("ColumnNames")
+    header = data.get("IncludeHeader")
+    encoding = data.get("FixedWidthEncoding")
+    column_lengths = data.get("Offsets")
+    column_types = data.get("DataTypes") or ["str"] * len(column_names)
+    column_formats = data.get("Formats") or [None] * len(column_names)
 
-        if len(column_names) != len(column_lengths):
-            raise ValueError("Offsets length must be the same as ColumnNames length")
+    validate_encoding(encoding)
 
-        column_offsets = [0] + list(accumulate(column_lengths))[:-1]
-        spec_values = zip(column_names, column_offsets, column_lengths)
-        columns = [FWFColumnSpec(*col) for col in spec_values]
+    if len(column_names) != len(column_lengths):
+        raise ValueError("Offsets length must be the same as ColumnNames length")
+    if len(column_names) != len(column_types) or len(column_names) != len(column_formats):
+        raise ValueError("DataTypes and Formats length must be the same as ColumnNames length")
+    for name, dtype, fmt in zip(column_names, column_types, column_formats):
+        if dtype not in _RND_VALUES_GENERATOR_BY_TYPE:
+            raise ValueError(f"Unexpected datatype {dtype}")
+        if dtype == "decimal":
+            _decimal_scale(FWFColumnSpec(name, 0, 0, dtype, fmt))
 
-        return FWFSpec(header=header, encoding=encoding, columns=columns)
-    except Exception as e:
-        logger.error(f"Error loading FWF spec JSON: {e}")
-        raise
+    column_offsets = [0] + list(accumulate(column_lengths))[:-1]
+    spec_values = zip(column_names, column_offsets, column_lengths, column_types, column_formats)
+    return tuple(spec_values), header, encoding
 
 def write_csv_file(spec: CSVSpec, lines: Iterator[Iterator[Any]], csv_output_file: pathlib.Path):
     try:
@@ -128,11 +196,244 @@ def write_csv_file(spec: CSVSpec, lines: Iterator[Iterator[Any]], csv_output_fil
         logger.error(f"Error writing CSV file: {e}")
         raise
 
+def write_csv_batches(
+    spec: CSVSpec,
+    batches: Iterator[ColumnBatch],
+    output_file: pathlib.Path,
+    row_group_size: Optional[int] = None,
+    fwf_spec: Optional[FWFSpec] = None,
+) -> None:
+    """Writes batches of column buffers as CSV rows; `row_group_size` and
+    `fwf_spec` are unused."""
+    with open(output_file, "w", newline="", encoding=spec.encoding) as f:
+        writer = csv.writer(f, delimiter=spec.delimiter, quotechar=spec.quotechar)
+        if spec.header:
+            writer.writerow(spec.column_names)
+        for columns in batches:
+            writer.writerows(zip(*columns))
+
+def _decimal_scale(column_spec: FWFColumnSpec) -> int:
+    """Returns the number of digits of a `.Nf` decimal format; Arrow and Spark
+    decimals need a fixed scale, so any other format is rejected."""
+    match = re.fullmatch(r"\.(\d+)f", column_spec.fmt or "")
+    if match is None:
+        raise ValueError(f"Decimal column {column_spec.name} requires a format such as .2f, got {column_spec.fmt}")
+    return int(match.group(1))
+
+def _arrow_schema(fwf_spec: FWFSpec, column_names: Sequence[str]):
+    """Builds the Arrow schema of the declared data types of `fwf_spec`, with
+    its columns named by `column_names`."""
+    import pyarrow as pa
+
+    types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "date": pa.date32()}
+    fields = []
+    for name, col in zip(column_names, fwf_spec.columns):
+        if col.dtype == "decimal":
+            dtype = pa.decimal128(38, _decimal_scale(col))
+        elif col.dtype in types:
+            dtype = types[col.dtype]
+        else:
+            raise ValueError(f"Unexpected datatype {col.dtype} for column {col.name}")
+        fields.append(pa.field(name, dtype))
+    return pa.schema(fields)
+
+def _arrow_record_batches(spec: CSVSpec, batches: Iterator[ColumnBatch], fwf_spec: Optional[FWFSpec] = None):
+    """Converts column buffers to Arrow record batches sharing one schema.
+
+    The schema holds the declared data types of `fwf_spec`, which must
+    describe the columns of the batches. Without it the schema is inferred
+    from the first batch: columns that are empty there are typed as strings
+    and decimals are widened to the maximum precision.
+    """
+    import pyarrow as pa
+
+    schema = None if fwf_spec is None else _arrow_schema(fwf_spec, spec.column_names)
+    empty = True
+    for columns in batches:
+        empty = False
+        if schema is None:
+            fields = []
+            for name, values in zip(spec.column_names, columns):
+                dtype = pa.array(values).type
+                if pa.types.is_null(dtype):
+                    dtype = pa.string()
+                elif pa.types.is_decimal(dtype):
+                    dtype = pa.decimal128(38, dtype.scale)
+                fields.append(pa.field(name, dtype))
+            schema = pa.schema(fields)
+        arrays = [pa.array(values, type=field.type) for field, values in zip(schema, columns)]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+    if empty:
+        schema = schema or pa.schema([(name, pa.string()) for name in spec.column_names])
+        yield pa.RecordBatch.from_pylist([], schema=schema)
+
+def write_arrow_batches(
+    spec: CSVSpec,
+    batches: Iterator[ColumnBatch],
+    output_file: pathlib.Path,
+    row_group_size: Optional[int] = None,
+    fwf_spec: Optional[FWFSpec] = None,
+) -> None:
+    """Writes batches of column buffers as an Arrow IPC (Feather v2) file with
+    record batches of at most `row_group_size` rows. The declared data types
+    of `fwf_spec` give the schema. Requires pyarrow."""
+    import pyarrow as pa
+
+    writer = None
+    try:
+        for record_batch in _arrow_record_batches(spec, batches, fwf_spec):
+            if writer is None:
+                writer = pa.ipc.new_file(str(output_file), record_batch.schema)
+            writer.write_table(pa.Table.from_batches([record_batch]), max_chunksize=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_parquet_batches(
+    spec: CSVSpec,
+    batches: Iterator[ColumnBatch],
+    output_file: pathlib.Path,
+    row_group_size: Optional[int] = None,
+    fwf_spec: Optional[FWFSpec] = None,
+) -> None:
+    """Writes batches of column buffers as a Parquet file with row groups of at
+    most `row_group_size` rows. The declared data types of `fwf_spec` give the
+    schema. Requires pyarrow."""
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for record_batch in _arrow_record_batches(spec, batches, fwf_spec):
+            if writer is None:
+                writer = pq.ParquetWriter(str(output_file), record_batch.schema)
+            writer.write_batch(record_batch, row_group_size=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+
+_SINKS_BY_FORMAT = {
+    "csv": write_csv_batches,
+    "arrow": write_arrow_batches,
+    "parquet": write_parquet_batches,
+}
+
+def write_batches(
+    output_format: str,
+    spec: CSVSpec,
+    batches: Iterator[ColumnBatch],
+    output_file: pathlib.Path,
+    row_group_size: Optional[int] = None,
+    fwf_spec: Optional[FWFSpec] = None,
+) -> None:
+    """Writes batches of column buffers with the sink registered for `output_format`.
+
+    `spec.column_names` names the columns of every sink; the header, encoding,
+    delimiter and quote character only apply to CSV. Arrow and Parquet take
+    their schema from the declared data types of `fwf_spec`, the projected
+    spec of the batches, and infer it from the first batch without it.
+    """
+    try:
+        sink = _SINKS_BY_FORMAT.get(output_format)
+        if sink is None:
+            raise ValueError(f"Unexpected output format {output_format}")
+        if output_file.parent:
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+        sink(spec, batches, output_file, row_group_size, fwf_spec)
+    except Exception as e:
+        logger.error(f"Error writing {output_format} file: {e}")
+        raise
+
 def _create_fwf_header(spec: FWFSpec) -> str:
-    header = ""
-    for col in spec.columns:
-        header += col.name.ljust(col.length, " ")
-    return header
+    return "".join(col.name.ljust(col.length, " ") for col in spec.columns)
+
+@functools.lru_cache(maxsize=None)
+def _is_single_byte_encoding(encoding: str) -> bool:
+    """Whether every byte decodes to exactly one character, so that character
+    offsets equal byte offsets. Multi-byte decoders buffer lead bytes."""
+    decoder = codecs.getincrementaldecoder(encoding)
+    return all(len(decoder(errors="replace").decode(bytes([b]))) == 1 for b in range(256))
+
+@dataclasses.dataclass(frozen=True)
+class CompiledFWFSpec:
+    """A FWFSpec with the layout derived from it, built once per distinct spec
+    by `compile_fwf_spec`.
+
+    It exposes `columns`, `header` and `encoding`, so it can be passed to any
+    function taking a FWFSpec; the wrapped spec must not be modified.
+    `record_struct` unpacks an encoded line into its column bytes and is only
+    set for single-byte encodings and columns laid out back to back.
+    """
+    spec: FWFSpec
+    slices: Tuple[slice, ...]
+    record_length: int
+    header_bytes: bytes
+    codec: codecs.CodecInfo
+    record_struct: Optional[struct.Struct]
+    _projection_structs: Dict[Tuple[str, ...], Tuple[struct.Struct, Tuple[str, ...]]] = dataclasses.field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    @property
+    def columns(self) -> List[FWFColumnSpec]:
+        return self.spec.columns
+
+    @property
+    def header(self) -> bool:
+        return self.spec.header
+
+    @property
+    def encoding(self) -> str:
+        return self.spec.encoding
+
+    def projection_struct(self, names: Sequence[str]) -> Tuple[struct.Struct, Tuple[str, ...]]:
+        """Returns a struct unpacking only the named columns of a line, the
+        others being skipped as pad bytes, with the unpacked column names in
+        field order. It is built once per projection."""
+        key = tuple(names)
+        entry = self._projection_structs.get(key)
+        if entry is None:
+            fmt, unpacked = [], []
+            for col in self.columns:
+                if col.name in key:
+                    fmt.append(f"{col.length}s")
+                    unpacked.append(col.name)
+                else:
+                    fmt.append(f"{col.length}x")
+            entry = self._projection_structs[key] = (struct.Struct("".join(fmt) + "x"), tuple(unpacked))
+        return entry
+
+    def __reduce__(self):
+        # Codec objects are not picklable; worker processes compile the spec again.
+        return compile_fwf_spec, (self.spec,)
+
+def _fwf_spec_key(spec: FWFSpec) -> Tuple[Tuple[Tuple[Any, ...], ...], bool, str]:
+    columns = tuple((col.name, col.offset, col.length, col.dtype, col.fmt) for col in spec.columns)
+    return columns, spec.header, spec.encoding
+
+def compile_fwf_spec(spec: FWFSpec) -> CompiledFWFSpec:
+    """Returns the compiled form of `spec`, memoized by the spec's content."""
+    if isinstance(spec, CompiledFWFSpec):
+        return spec
+    return _compile_fwf_spec(_fwf_spec_key(spec))
+
+@functools.lru_cache(maxsize=256)
+def _compile_fwf_spec(key: Tuple[Tuple[Tuple[Any, ...], ...], bool, str]) -> CompiledFWFSpec:
+    columns, header, encoding = key
+    spec = FWFSpec(columns=[FWFColumnSpec(*col) for col in columns], header=header, encoding=encoding)
+    codec = codecs.lookup(encoding)
+    lengths = [col.length for col in spec.columns]
+    record_struct = None
+    if [col.offset for col in spec.columns] == list(accumulate([0] + lengths))[:-1] \
+            and _is_single_byte_encoding(encoding):
+        record_struct = struct.Struct("".join(f"{length}s" for length in lengths) + "x")
+    return CompiledFWFSpec(
+        spec=spec,
+        slices=tuple(slice(col.offset, col.offset + col.length, None) for col in spec.columns),
+        record_length=sum(lengths),
+        header_bytes=codec.encode(_create_fwf_header(spec) + "\n")[0] if header else b"",
+        codec=codec,
+        record_struct=record_struct,
+    )
 
 def _generate_fwf_lines(
     spec: FWFSpec, number_of_lines: int, rnd_value_generator: Callable[[FWFColumnSpec], str]
@@ -156,15 +457,132 @@ def generate_fwf_lines(
     else:
         return rows_generator
 
+# Maps the byte values below 234 = 9 * 26 to lowercase letters, 9 values each;
+# the others are deleted and drawn again, so every letter has probability 1/26.
+_RND_LOWERCASE_TABLE = bytes(ord(string.ascii_lowercase[b % 26]) for b in range(256))
+_RND_LOWERCASE_REJECTED = bytes(range(9 * 26, 256))
+
+def _can_generate_fwf_blocks(spec: FWFSpec, rnd_value_generator: Callable[[FWFColumnSpec], str]) -> bool:
+    return (
+        rnd_value_generator is rnd_fwf_value
+        and all(col.dtype == "str" for col in spec.columns)
+        and _is_ascii_compatible(spec.encoding)
+    )
+
+def _generate_fwf_block(spec: FWFSpec, rows: int, seed: int, block_index: int) -> bytearray:
+    """Generates `rows` encoded random lines.
+
+    Every block draws from its own generator seeded with (seed, block_index),
+    so the output does not depend on how blocks are spread over workers.
+    """
+    record_length = compile_fwf_spec(spec).record_length
+    line_length = record_length + 1
+    rng = rnd.Random(f"{seed}/{block_index}")
+    size = rows * line_length
+    block = bytearray()
+    while len(block) < size:
+        # About 9% of the bytes are rejected; drawing 1/8 more usually fills the block at once.
+        draw = rng.randbytes((size - len(block)) * 9 // 8 + 16)
+        block += draw.translate(_RND_LOWERCASE_TABLE, _RND_LOWERCASE_REJECTED)
+    del block[size:]
+    block[record_length::line_length] = b"\n" * rows
+    return block
+
+def _block_rows(number_of_lines: int, block_size: int, block_index: int) -> int:
+    return min(block_size, number_of_lines - block_index * block_size)
+
+def _write_at(f, data: bytes, offset: int) -> None:
+    if hasattr(os, "pwrite"):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(f.fileno(), view, offset)
+            view = view[written:]
+            offset += written
+    else:
+        f.seek(offset)
+        f.write(data)
+
+def _generate_fwf_shard(
+    spec: FWFSpec,
+    output_file: pathlib.Path,
+    number_of_lines: int,
+    data_start: int,
+    seed: int,
+    block_size: int,
+    first_block: int,
+    last_block: int,
+) -> None:
+    line_length = compile_fwf_spec(spec).record_length + 1
+    with open(output_file, "r+b") as f:
+        for block_index in range(first_block, last_block):
+            rows = _block_rows(number_of_lines, block_size, block_index)
+            block = _generate_fwf_block(spec, rows, seed, block_index)
+            _write_at(f, block, data_start + block_index * block_size * line_length)
+
+def _generate_fwf_file_blocks(
+    spec: FWFSpec,
+    number_of_lines: int,
+    output_file: pathlib.Path,
+    seed: Optional[int],
+    block_size: int,
+    workers: int,
+) -> None:
+    if number_of_lines <= 0:
+        raise ValueError("number_of_lines should be > 0")
+    if seed is None:
+        seed = rnd.randrange(2 ** 64)
+    compiled = compile_fwf_spec(spec)
+    header = compiled.header_bytes
+    blocks = -(-number_of_lines // block_size)
+
+    if workers <= 1 or blocks == 1:
+        with open(output_file, "wb") as f:
+            f.write(header)
+            for block_index in range(blocks):
+                rows = _block_rows(number_of_lines, block_size, block_index)
+                f.write(_generate_fwf_block(spec, rows, seed, block_index))
+        return
+
+    line_length = compiled.record_length + 1
+    with open(output_file, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + number_of_lines * line_length)
+
+    shards = min(blocks, workers * 4)
+    bounds = [blocks * i // shards for i in range(shards + 1)]
+    tasks = [
+        (spec, output_file, number_of_lines, len(header), seed, block_size, first, last)
+        for first, last in zip(bounds, bounds[1:])
+    ]
+    with mp.Pool(processes=min(workers, shards)) as pool:
+        pool.starmap(_generate_fwf_shard, tasks)
+
 def generate_fwf_file(
     spec: FWFSpec,
     number_of_lines: int,
     output_file: pathlib.Path,
     rnd_value_generator: Callable[[FWFColumnSpec], str] = rnd_fwf_value,
+    seed: Optional[int] = None,
+    block_size: int = 65536,
+    workers: int = 1,
 ) -> None:
+    """Generates a FWF file with random values.
+
+    String-only specs using the default value generator are written in blocks
+    of `block_size` lines, spread over `workers` processes that write their
+    shards into a pre-sized output file. The output for a given `seed` and
+    `block_size` does not depend on `workers`. Any other spec or a custom
+    `rnd_value_generator` goes through `generate_fwf_lines` in this process,
+    after seeding the `random` module when a `seed` is given.
+    """
     try:
         if output_file.parent:
             output_file.parent.mkdir(parents=True, exist_ok=True)
+        if _can_generate_fwf_blocks(spec, rnd_value_generator):
+            _generate_fwf_file_blocks(spec, number_of_lines, output_file, seed, block_size, workers)
+            return
+        if seed is not None:
+            rnd.seed(seed)
         with open(output_file, "w", 1024, encoding=spec.encoding, newline="") as f:
             lines = generate_fwf_lines(spec, number_of_lines, rnd_value_generator)
             f.writelines((line + "\n" for line in lines))
@@ -172,17 +590,532 @@ def generate_fwf_file(
         logger.error(f"Error generating FWF file: {e}")
         raise
 
+def select_fwf_columns(spec: FWFSpec, columns: Optional[List[str]]) -> FWFSpec:
+    """Returns a spec with only the given columns, in the given order."""
+    if columns is None:
+        return spec
+    by_name = {col.name: col for col in spec.columns}
+    for name in columns:
+        if name not in by_name:
+            raise ValueError(f"Unexpected column {name}")
+    return dataclasses.replace(compile_fwf_spec(spec).spec, columns=[by_name[name] for name in columns])
+
+def select_csv_columns(fwf_spec: FWFSpec, csv_spec: CSVSpec, columns: Optional[List[str]]) -> CSVSpec:
+    """Returns a CSV spec whose header matches a projection of the FWF columns."""
+    if columns is None:
+        return csv_spec
+    positions = {col.name: i for i, col in enumerate(fwf_spec.columns)}
+    for name in columns:
+        if name not in positions:
+            raise ValueError(f"Unexpected column {name}")
+    return dataclasses.replace(csv_spec, column_names=[csv_spec.column_names[positions[name]] for name in columns])
+
+_PREDICATE_PATTERN = re.compile(r"^(.+?)(\^=|>=|<=|=)(.*)$")
+
+def parse_fwf_predicate(expression: str) -> FWFPredicate:
+    """Parses `col=value`, `col^=prefix`, `col>=low` or `col<=high`."""
+    match = _PREDICATE_PATTERN.match(expression)
+    if match is None:
+        raise ValueError(f"Unexpected filter expression {expression}")
+    column, op, value = match.groups()
+    if op == "=":
+        return FWFPredicate(column, "eq", value)
+    if op == "^=":
+        return FWFPredicate(column, "prefix", value)
+    if op == ">=":
+        return FWFPredicate(column, "range", value=value)
+    return FWFPredicate(column, "range", high=value)
+
+def _predicate_test(
+    predicate: FWFPredicate, column_spec: FWFColumnSpec, encoding: Optional[str]
+) -> Callable[[Any], bool]:
+    if predicate.op == "range" and column_spec.dtype in _COLUMN_CONVERTERS_BY_TYPE:
+        return _typed_range_test(predicate, column_spec, encoding)
+    encode = (lambda v: v if v is None else v.encode(encoding)) if encoding else (lambda v: v)
+    value, high = encode(predicate.value), encode(predicate.high)
+    if predicate.op == "eq":
+        return lambda raw: raw == value
+    if predicate.op == "prefix":
+        return lambda raw: raw.startswith(value)
+    if predicate.op == "range":
+        if high is None:
+            return lambda raw: raw >= value
+        if value is None:
+            return lambda raw: raw <= high
+        return lambda raw: value <= raw <= high
+    raise ValueError(f"Unexpected filter operator {predicate.op}")
+
+def _typed_range_test(
+    predicate: FWFPredicate, column_spec: FWFColumnSpec, encoding: Optional[str]
+) -> Callable[[Any], bool]:
+    """Compares raw values converted to the column's data type with the
+    converted bounds; empty values never match."""
+    convert_column = _COLUMN_CONVERTERS_BY_TYPE[column_spec.dtype](column_spec)
+    low, high = convert_column([predicate.value or "", predicate.high or ""])
+    decode = (lambda raw: raw.decode(encoding)) if encoding else (lambda raw: raw)
+
+    def test(raw) -> bool:
+        value = convert_column([decode(raw)])[0]
+        return value is not None and (low is None or value >= low) and (high is None or value <= high)
+    return test
+
+def _compile_where(
+    spec: FWFSpec, where: Optional[List[FWFPredicate]]
+) -> List[Tuple[slice, FWFPredicate, FWFColumnSpec]]:
+    by_name = {col.name: col for col in spec.columns}
+    compiled = []
+    for predicate in where or []:
+        col = by_name.get(predicate.column)
+        if col is None:
+            raise ValueError(f"Unexpected column {predicate.column}")
+        compiled.append((slice(col.offset, col.offset + col.length, None), predicate, col))
+    return compiled
+
+def _row_filter(
+    where: List[Tuple[slice, FWFPredicate, FWFColumnSpec]], encoding: Optional[str] = None
+) -> Optional[Callable[[Any], bool]]:
+    """Builds a filter over raw lines, bytes when `encoding` is given, else str."""
+    if not where:
+        return None
+    tests = [(s, _predicate_test(predicate, col, encoding)) for s, predicate, col in where]
+
+    def accept(line) -> bool:
+        for s, test in tests:
+            if not test(line[s].strip()):
+                return False
+        return True
+    return accept
+
+def _parse_fwf_file_text(
+    spec: FWFSpec, input_file: pathlib.Path, where: List[Tuple[slice, FWFPredicate, FWFColumnSpec]], batch_size: int
+) -> Iterator[List[List[str]]]:
+    with open(input_file, "r", 1024 * 1024, encoding=spec.encoding) as f:
+        if spec.header:
+            next(f, None)
+        yield from _iter_fwf_text_batches(spec, f, where, batch_size)
+
+def _iter_fwf_text_batches(
+    spec: FWFSpec, f: io.TextIOBase, where: List[Tuple[slice, FWFPredicate, FWFColumnSpec]], batch_size: int
+) -> Iterator[List[List[str]]]:
+    slices = compile_fwf_spec(spec).slices
+    accept = _row_filter(where)
+    while True:
+        lines = list(islice(f, batch_size))
+        if not lines:
+            return
+        if accept is not None:
+            lines = [line for line in lines if accept(line)]
+        yield [[line[s].strip() for s in slices] for line in lines]
+
+def _can_unpack_fwf_records(
+    spec: FWFSpec, engine: str, columns: Optional[List[str]], where: Optional[List[FWFPredicate]]
+) -> bool:
+    # Filters reject raw lines before any column is sliced, which beats
+    # unpacking every record, so filtered reads stay on the text layer.
+    return (
+        engine == "text"
+        and not where
+        and columns != []
+        and compile_fwf_spec(spec).record_struct is not None
+        and _is_ascii_compatible(spec.encoding)
+    )
+
+def _parse_fwf_file_struct(
+    spec: FWFSpec,
+    input_file: pathlib.Path,
+    columns: Optional[List[str]],
+    batch_size: int,
+    as_rows: bool = False,
+) -> Iterator[Any]:
+    """Unpacks blocks of `batch_size` records of a single-byte encoded file
+    with `struct.iter_unpack`, reading only the selected columns. Yields
+    column batches, or batches of rows with `as_rows`.
+
+    Character and byte offsets are the same, so all fields of a block are
+    joined with newlines, decoded and split in one call each, and every
+    column is a stride of the result. A block whose line breaks are not
+    exactly one `\\n` per record (other record lengths, `\\r\\n`, a last
+    line without terminator) sends the rest of the file through the text
+    layer, which keeps the output identical to the text engine.
+    """
+    selected = select_fwf_columns(spec, columns)
+    compiled = compile_fwf_spec(spec)
+    record, unpacked = compiled.projection_struct([col.name for col in selected.columns])
+    newlines = compiled.record_length
+    fields = len(unpacked)
+    indexes = [unpacked.index(col.name) for col in selected.columns]
+    encoding = spec.encoding
+
+    def text_batches(f, position: int, skip_header: bool) -> Iterator[Any]:
+        f.seek(position)
+        text = io.TextIOWrapper(f, encoding=encoding)
+        if skip_header:
+            next(text, None)
+        for text_rows in _iter_fwf_text_batches(selected, text, [], batch_size):
+            if text_rows:
+                yield text_rows if as_rows else list(zip(*text_rows))
+        text.detach()
+
+    with open(input_file, "rb", 1024 * 1024) as f:
+        if spec.header:
+            # A header that does not end with a lone "\n" may end with "\r",
+            # which only the text layer recognises as a line break.
+            header = f.readline()
+            if b"\r" in header or not header.endswith(b"\n"):
+                yield from text_batches(f, 0, True)
+                return
+        while True:
+            position = f.tell()
+            block = f.read(record.size * batch_size)
+            if not block:
+                return
+            rows = len(block) // record.size
+            if (len(block) != rows * record.size or block.count(b"\n") != rows
+                    or block[newlines::record.size] != b"\n" * rows or b"\r" in block):
+                yield from text_batches(f, position, False)
+                return
+            values = b"\n".join(chain.from_iterable(record.iter_unpack(block))).decode(encoding).split("\n")
+            values = list(map(str.strip, values))
+            if as_rows and indexes == list(range(fields)):
+                yield [values[i:i + fields] for i in range(0, len(values), fields)]
+                continue
+            batch = [values[i::fields] for i in indexes]
+            yield list(map(list, zip(*batch))) if as_rows else batch
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    return "\n".encode(encoding) == b"\n" and "a".encode(encoding) == b"a"
+
+def _fwf_line_end(mm: mmap.mmap, position: int, end: int) -> int:
+    """Returns the offset after the first line break at or after `position`,
+    or `end`. Like the text engine, a lone `\\r` is a line break too."""
+    newline = mm.find(b"\n", position, end)
+    cr = mm.find(b"\r", position, end if newline == -1 else newline)
+    if cr != -1:
+        return cr + 2 if mm[cr + 1:cr + 2] == b"\n" else cr + 1
+    return end if newline == -1 else newline + 1
+
+def _iter_fwf_mmap_batches(
+    spec: FWFSpec,
+    mm: mmap.mmap,
+    start: int,
+    end: int,
+    where: List[Tuple[slice, FWFPredicate, FWFColumnSpec]] = (),
+    batch_size: int = 10000,
+) -> Iterator[List[List[str]]]:
+    """Slices the records in the byte range [start, end) of a memory-mapped file,
+    one block of about `batch_size` lines at a time.
+
+    ASCII-only blocks have the same character and byte offsets, so filters run
+    on the raw bytes and only accepted lines are decoded, or the whole block in
+    a single call when there is no filter. Any other line is decoded as a whole
+    and sliced by characters. A block with a `\\r` that is not followed by `\\n`
+    goes through the text layer, which keeps the output identical to the text
+    engine.
+    """
+    encoding = spec.encoding
+    slices = compile_fwf_spec(spec).slices
+    accept_bytes = _row_filter(where, encoding)
+    accept_text = _row_filter(where)
+    line_length = max((col.offset + col.length for col in spec.columns), default=0) + 1
+    block_length = max(1, batch_size * line_length)
+    position = start
+    while position < end:
+        stop = min(position + block_length, end)
+        if stop < end:
+            stop = _fwf_line_end(mm, stop - 1, end)
+        block = mm[position:stop]
+        position = stop
+        if b"\r" in block and block.count(b"\r") != block.count(b"\r\n"):
+            text = io.StringIO(block.decode(encoding), newline=None)
+            yield from _iter_fwf_text_batches(spec, text, where, batch_size)
+            continue
+        if block.isascii():
+            if accept_bytes is None:
+                lines = block.decode(encoding).split("\n")
+            else:
+                lines = [line.decode(encoding) for line in block.split(b"\n") if accept_bytes(line)]
+            if lines and not lines[-1]:
+                lines.pop()
+            yield [[line[s].strip() for s in slices] for line in lines]
+            continue
+        lines = block.split(b"\n")
+        if not lines[-1]:
+            lines.pop()
+        rows = []
+        for line in lines:
+            if line.isascii():
+                if accept_bytes is None or accept_bytes(line):
+                    rows.append([line[s].decode(encoding).strip() for s in slices])
+            else:
+                text = line.decode(encoding)
+                if accept_text is None or accept_text(text):
+                    rows.append([text[s].strip() for s in slices])
+        yield rows
+
+def _open_fwf_mmap(spec: FWFSpec, f) -> Optional[mmap.mmap]:
+    if not _is_ascii_compatible(spec.encoding):
+        raise ValueError(f"Encoding {spec.encoding} is not supported by the mmap engine")
+    if os.fstat(f.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _parse_fwf_file_mmap(
+    spec: FWFSpec, input_file: pathlib.Path, where: List[Tuple[slice, FWFPredicate, FWFColumnSpec]], batch_size: int
+) -> Iterator[List[List[str]]]:
+    with open(input_file, "rb") as f:
+        mm = _open_fwf_mmap(spec, f)
+        if mm is None:
+            return
+        with mm:
+            if spec.header:
+                mm.seek(_fwf_line_end(mm, 0, mm.size()))
+            yield from _iter_fwf_mmap_batches(spec, mm, mm.tell(), mm.size(), where, batch_size)
+
+# Engines yield batches of rows, so the interpreter resumes one generator per
+# batch rather than one per record.
+_PARSE_ENGINES = {
+    "text": _parse_fwf_file_text,
+    "mmap": _parse_fwf_file_mmap,
+}
+
+def batches_to_rows(batches: Iterator[ColumnBatch]) -> Iterator[Tuple[Any, ...]]:
+    """Adapts column batches to the row iterator taken by `write_csv_file`."""
+    return chain.from_iterable(zip(*columns) for columns in batches)
+
+def rows_to_batches(rows: Iterator[Iterator[Any]], batch_size: int = 10000) -> Iterator[ColumnBatch]:
+    """Adapts a row iterator to column batches of at most `batch_size` rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield list(zip(*batch))
+
+def _convert_values(convert: Callable[[str], Any]) -> Callable[[Sequence[str]], List[Any]]:
+    def convert_column(values: Sequence[str]) -> List[Any]:
+        if "" in values:
+            return [convert(v) if v else None for v in values]
+        return list(map(convert, values))
+    return convert_column
+
+def _convert_unique_values(convert: Callable[[str], Any]) -> Callable[[Sequence[str]], List[Any]]:
+    def convert_column(values: Sequence[str]) -> List[Any]:
+        lookup = {v: convert(v) for v in set(values) if v}
+        return list(map(lookup.get, values))
+    return convert_column
+
+def _date_converter(column_spec: FWFColumnSpec) -> Callable[[Sequence[str]], List[Any]]:
+    fmt = column_spec.fmt or "%Y-%m-%d"
+    strptime = datetime.datetime.strptime
+    return _convert_unique_values(lambda v: strptime(v, fmt).date())
+
+_COLUMN_CONVERTERS_BY_TYPE = {
+    "int": lambda column_spec: _convert_values(int),
+    "float": lambda column_spec: _convert_values(float),
+    "decimal": lambda column_spec: _convert_values(decimal.Decimal),
+    "date": _date_converter,
+}
+
+def typed_batch_converter(spec: FWFSpec) -> Callable[[ColumnBatch], ColumnBatch]:
+    """Returns a batch transform converting the typed columns of `spec` a whole
+    column buffer at a time; empty fields become None."""
+    converters = [
+        _COLUMN_CONVERTERS_BY_TYPE[col.dtype](col) if col.dtype in _COLUMN_CONVERTERS_BY_TYPE else None
+        for col in spec.columns
+    ]
+
+    def convert_batch(columns: ColumnBatch) -> ColumnBatch:
+        return [values if convert is None else convert(values) for convert, values in zip(converters, columns)]
+    return convert_batch
+
+def _parse_fwf_row_batches(
+    spec: FWFSpec,
+    input_file: pathlib.Path,
+    engine: str,
+    batch_size: int,
+    columns: Optional[List[str]],
+    where: Optional[List[FWFPredicate]],
+) -> Tuple[FWFSpec, Iterator[List[List[str]]]]:
+    parser = _PARSE_ENGINES.get(engine)
+    if parser is None:
+        raise ValueError(f"Unexpected parse engine {engine}")
+    selected = select_fwf_columns(spec, columns)
+    return selected, parser(selected, input_file, _compile_where(spec, where), batch_size)
+
+def _parse_fwf_column_batches(
+    spec: FWFSpec,
+    input_file: pathlib.Path,
+    engine: str,
+    batch_size: int,
+    columns: Optional[List[str]],
+    where: Optional[List[FWFPredicate]],
+) -> Tuple[FWFSpec, Iterator[ColumnBatch]]:
+    """Column batches from the struct fast path when the spec allows it, else
+    from the row batches of `engine`."""
+    if _can_unpack_fwf_records(spec, engine, columns, where):
+        return select_fwf_columns(spec, columns), _parse_fwf_file_struct(spec, input_file, columns, batch_size)
+    selected, row_batches = _parse_fwf_row_batches(spec, input_file, engine, batch_size, columns, where)
+    return selected, (list(zip(*rows)) for rows in row_batches if rows)
+
+def parse_fwf_batches(
+    spec: FWFSpec,
+    input_file: pathlib.Path,
+    engine: str = "text",
+    typed: bool = False,
+    batch_size: int = 10000,
+    columns: Optional[List[str]] = None,
+    where: Optional[List[FWFPredicate]] = None,
+) -> Iterator[ColumnBatch]:
+    """Parses a FWF file into column batches of at most `batch_size` rows.
+
+    `columns` projects the output onto the named columns. Rows failing any of
+    the `where` predicates are skipped before their columns are decoded. With
+    `typed`, columns are converted to their declared data types.
+
+    The text engine unpacks the records of single-byte encodings such as
+    ascii and windows-1252 with `struct` and decodes them a column at a time.
+    """
+    try:
+        selected, column_batches = _parse_fwf_column_batches(spec, input_file, engine, batch_size, columns, where)
+        convert = typed_batch_converter(selected) if typed else None
+        for batch in column_batches:
+            yield batch if convert is None else convert(batch)
+    except Exception as e:
+        logger.error(f"Error parsing FWF file: {e}")
+        raise
+
 def parse_fwf_file(
     spec: FWFSpec,
     input_file: pathlib.Path,
+    engine: str = "text",
+    typed: bool = False,
+    batch_size: int = 10000,
+    columns: Optional[List[str]] = None,
+    where: Optional[List[FWFPredicate]] = None,
+) -> Iterator[Iterator[Any]]:
+    """Row iterator over a FWF file; arguments are as in `parse_fwf_batches`."""
+    if typed:
+        return batches_to_rows(parse_fwf_batches(spec, input_file, engine, typed, batch_size, columns, where))
+    return _parse_fwf_rows(spec, input_file, engine, batch_size, columns, where)
+
+def _parse_fwf_rows(
+    spec: FWFSpec,
+    input_file: pathlib.Path,
+    engine: str,
+    batch_size: int,
+    columns: Optional[List[str]],
+    where: Optional[List[FWFPredicate]],
 ) -> Iterator[Iterator[Any]]:
     try:
-        slices = [slice(col.offset, col.offset + col.length, None) for col in spec.columns]
-        with open(input_file, "r", 1024, encoding=spec.encoding) as f:
-            if spec.header:
-                next(f)
-            for line in f:
-                yield (line[s].strip() for s in slices)
+        # Whole rows are sliced from decoded lines as fast as they are
+        # unpacked, so the struct path is only taken when it skips columns.
+        if columns is not None and _can_unpack_fwf_records(spec, engine, columns, where):
+            for rows in _parse_fwf_file_struct(spec, input_file, columns, batch_size, as_rows=True):
+                yield from rows
+            return
+        _, row_batches = _parse_fwf_row_batches(spec, input_file, engine, batch_size, columns, where)
+        for rows in row_batches:
+            yield from rows
     except Exception as e:
         logger.error(f"Error parsing FWF file: {e}")
         raise
+
+def _fwf_record_length(spec: FWFSpec) -> int:
+    return compile_fwf_spec(spec).record_length + 1
+
+def split_fwf_file(spec: FWFSpec, input_file: pathlib.Path, chunks: int) -> List[Tuple[int, int]]:
+    """Splits the data records of a FWF file into at most `chunks` byte ranges.
+
+    Boundaries are computed from the record length, so for fixed-width records
+    they land on a record boundary without scanning the file. Each boundary is
+    still moved forward to the next line start, which keeps the ranges correct
+    for records whose byte length varies (e.g. multi-byte UTF-8 characters)
+    and for `\\r` line breaks.
+    """
+    with open(input_file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = _fwf_line_end(mm, 0, size) if spec.header else 0
+            record_length = _fwf_record_length(spec)
+            records = max(1, (size - start) // record_length)
+            records_per_chunk = -(-records // max(1, chunks))
+            bounds = [start]
+            for i in range(1, chunks):
+                position = start + i * records_per_chunk * record_length
+                if position >= size:
+                    break
+                position = _fwf_line_end(mm, position - 1, size)
+                if bounds[-1] < position < size:
+                    bounds.append(position)
+            bounds.append(size)
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+
+def _convert_fwf_range(
+    fwf_spec: FWFSpec,
+    csv_spec: CSVSpec,
+    input_file: pathlib.Path,
+    part_file: pathlib.Path,
+    start: int,
+    end: int,
+    where: List[Tuple[slice, FWFPredicate, FWFColumnSpec]],
+) -> pathlib.Path:
+    with open(input_file, "rb") as f, \
+         open(part_file, "w", newline="", encoding=csv_spec.encoding) as out:
+        writer = csv.writer(out, delimiter=csv_spec.delimiter, quotechar=csv_spec.quotechar)
+        mm = _open_fwf_mmap(fwf_spec, f)
+        if mm is not None:
+            with mm:
+                for rows in _iter_fwf_mmap_batches(fwf_spec, mm, start, end, where):
+                    writer.writerows(rows)
+    return part_file
+
+def _create_csv_header(spec: CSVSpec) -> bytes:
+    buffer = io.StringIO(newline="")
+    csv.writer(buffer, delimiter=spec.delimiter, quotechar=spec.quotechar).writerow(spec.column_names)
+    return buffer.getvalue().encode(spec.encoding)
+
+def convert_fwf_file_parallel(
+    fwf_spec: FWFSpec,
+    csv_spec: CSVSpec,
+    input_file: pathlib.Path,
+    csv_output_file: pathlib.Path,
+    workers: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    where: Optional[List[FWFPredicate]] = None,
+) -> None:
+    """Converts a FWF file to CSV by splitting it into byte ranges that are
+    converted by a pool of worker processes and concatenated in order.
+
+    `columns` and `where` behave as in `parse_fwf_file`; `csv_spec` must
+    already describe the projected columns.
+    """
+    try:
+        workers = workers or mp.cpu_count()
+        if csv_output_file.parent:
+            csv_output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        selected = select_fwf_columns(fwf_spec, columns)
+        compiled_where = _compile_where(fwf_spec, where)
+        ranges = split_fwf_file(fwf_spec, input_file, workers)
+        parts_dir = pathlib.Path(tempfile.mkdtemp(dir=csv_output_file.parent))
+        try:
+            tasks = [
+                (selected, csv_spec, input_file, parts_dir / f"part-{i:05d}.csv", start, end, compiled_where)
+                for i, (start, end) in enumerate(ranges)
+            ]
+            with mp.Pool(processes=min(workers, max(1, len(tasks)))) as pool:
+                part_files = pool.starmap(_convert_fwf_range, tasks)
+
+            with open(csv_output_file, "wb") as out:
+                if csv_spec.header:
+                    out.write(_create_csv_header(csv_spec))
+                for part_file in part_files:
+                    with open(part_file, "rb") as part:
+                        shutil.copyfileobj(part, out)
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+    except Exception as e:
+        logger.error(f"Error converting FWF file: {e}")
+        raise
@@ -0,0 +1,78 @@
+import logging
+import pathlib
+from typing import Optional, Tuple
+
+import numpy as np
+
+from data_processor.data_processor import FWFSpec, _is_ascii_compatible, compile_fwf_spec
+
+logger = logging.getLogger(__name__)
+
+def fwf_spec_to_dtype(spec: FWFSpec, record_length: Optional[int] = None) -> np.dtype:
+    """Maps a FWF spec to a structured dtype with one `S<length>` field per column.
+
+    The itemsize defaults to the record length plus a `\\n` line terminator.
+    """
+    if record_length is None:
+        record_length = compile_fwf_spec(spec).record_length + 1
+    return np.dtype({
+        "names": [col.name for col in spec.columns],
+        "formats": [f"S{col.length}" for col in spec.columns],
+        "offsets": [col.offset for col in spec.columns],
+        "itemsize": record_length,
+    })
+
+def _fwf_layout(spec: FWFSpec, input_file: pathlib.Path) -> Tuple[int, int, int]:
+    """Returns the data start offset, record length in bytes and file size."""
+    with open(input_file, "rb") as f:
+        line = f.readline()
+        data_start = 0
+        if spec.header:
+            data_start = len(line)
+            line = f.readline()
+        newline_length = 2 if line.endswith(b"\r\n") else 1
+        size = f.seek(0, 2)
+    return data_start, compile_fwf_spec(spec).record_length + newline_length, size
+
+def read_fwf_array(
+    spec: FWFSpec,
+    input_file: pathlib.Path,
+    start_row: int = 0,
+    num_rows: Optional[int] = None,
+) -> np.ndarray:
+    """Memory-maps the data records of a FWF file as a structured array.
+
+    Requires every record to have the same byte length, i.e. a single-byte
+    encoding or ASCII-only data. Field values keep their padding; use
+    `decode_fwf_column` to get stripped strings.
+    """
+    try:
+        if not _is_ascii_compatible(spec.encoding):
+            raise ValueError(f"Encoding {spec.encoding} is not supported by the array reader")
+
+        data_start, record_length, size = _fwf_layout(spec, input_file)
+        dtype = fwf_spec_to_dtype(spec, record_length)
+        if (size - data_start) % record_length:
+            raise ValueError(
+                f"File size is not a multiple of the record length {record_length}; "
+                "records must have a fixed byte length"
+            )
+
+        total_rows = (size - data_start) // record_length
+        start_row = min(start_row, total_rows)
+        rows = total_rows - start_row if num_rows is None else min(num_rows, total_rows - start_row)
+        if rows <= 0:
+            return np.empty(0, dtype=dtype)
+
+        offset = data_start + start_row * record_length
+        raw = np.memmap(input_file, dtype=np.uint8, mode="r", offset=offset, shape=(rows, record_length))
+        if not (raw[:, -1] == ord("\n")).all():
+            raise ValueError("Records must have a fixed byte length")
+        return np.memmap(input_file, dtype=dtype, mode="r", offset=offset, shape=(rows,))
+    except Exception as e:
+        logger.error(f"Error reading FWF array: {e}")
+        raise
+
+def decode_fwf_column(spec: FWFSpec, records: np.ndarray, name: str) -> np.ndarray:
+    """Strips the padding of a column and decodes it to a unicode array."""
+    return np.char.decode(np.char.strip(records[name]), spec.encoding)
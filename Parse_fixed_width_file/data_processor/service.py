@@ -0,0 +1,265 @@
+import asyncio
+import concurrent.futures
+import dataclasses
+import json
+import logging
+import os
+import pathlib
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from data_processor.data_processor import (
+    CSVSpec, FWFSpec, load_csv_spec_file, load_fwf_spec_file, parse_fwf_batches, select_csv_columns,
+    select_fwf_columns, write_batches
+)
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS_BY_FORMAT = {
+    "csv": ".csv",
+    "arrow": ".arrow",
+    "parquet": ".parquet",
+}
+
+@dataclasses.dataclass
+class ConversionJob:
+    """A FWF file to convert with the spec and options of `csv_parser.py`."""
+    spec_file: pathlib.Path
+    fwf_file: pathlib.Path
+    output_file: pathlib.Path
+    output_format: str = "csv"
+    engine: str = "text"
+    columns: Optional[List[str]] = None
+    row_group_size: int = 100000
+
+@dataclasses.dataclass
+class ConversionResult:
+    """Outcome of a job; `latency` runs from submission to completion and
+    includes the `queued` time spent waiting for a worker."""
+    job: ConversionJob
+    latency: float
+    queued: float
+    error: Optional[str] = None
+
+    def to_json(self) -> Dict:
+        return {
+            "fwf_file": str(self.job.fwf_file),
+            "output_file": str(self.job.output_file),
+            "latency": round(self.latency, 6),
+            "queued": round(self.queued, 6),
+            "error": self.error,
+        }
+
+class SpecCache:
+    """Loaded specs by spec file path; an entry is reloaded when the file's mtime changes."""
+
+    def __init__(self):
+        self._entries: Dict[pathlib.Path, Tuple[int, FWFSpec, CSVSpec]] = {}
+
+    def get(self, spec_file: pathlib.Path) -> Tuple[FWFSpec, CSVSpec]:
+        path = pathlib.Path(spec_file).resolve()
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, load_fwf_spec_file(path), load_csv_spec_file(path))
+            self._entries[path] = entry
+        return entry[1], entry[2]
+
+def _convert_job(fwf_spec: FWFSpec, csv_spec: CSVSpec, job: ConversionJob, submitted: float) -> float:
+    """Runs a job in a worker process and returns the time since it was `submitted`."""
+    queued = time.time() - submitted
+    csv_spec = select_csv_columns(fwf_spec, csv_spec, job.columns)
+    batches = parse_fwf_batches(
+        fwf_spec, job.fwf_file, job.engine, typed=job.output_format != "csv",
+        batch_size=job.row_group_size, columns=job.columns,
+    )
+    write_batches(
+        job.output_format, csv_spec, batches, job.output_file, job.row_group_size,
+        select_fwf_columns(fwf_spec, job.columns),
+    )
+    return queued
+
+def _parse_request(request: Dict) -> ConversionJob:
+    return ConversionJob(
+        spec_file=pathlib.Path(request["spec_file"]),
+        fwf_file=pathlib.Path(request["fwf_file"]),
+        output_file=pathlib.Path(request["output_file"]),
+        output_format=request.get("format", "csv"),
+        engine=request.get("engine", "text"),
+        columns=request.get("columns"),
+    )
+
+class ConversionService:
+    """Long-running FWF conversion service.
+
+    Specs are loaded once per spec file version and conversions run in a pool
+    of `workers` processes; at most `max_pending` jobs are submitted to the
+    pool at a time, the others wait in the event loop. Jobs come from
+    `convert`, from watched directories and from a line-delimited JSON socket.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = workers or os.cpu_count()
+        self.spec_cache = SpecCache()
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        self._pending = asyncio.Semaphore(max_pending or 2 * self.workers)
+
+    async def __aenter__(self) -> "ConversionService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Waiting for the workers would block the event loop.
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def convert(self, job: ConversionJob) -> ConversionResult:
+        """Converts a file in the pool; failures are reported in the result."""
+        submitted = time.time()
+        queued = 0.0
+        error = None
+        try:
+            async with self._pending:
+                fwf_spec, csv_spec = self.spec_cache.get(job.spec_file)
+                loop = asyncio.get_running_loop()
+                executor = self._executor
+                try:
+                    queued = await loop.run_in_executor(executor, _convert_job, fwf_spec, csv_spec, job, submitted)
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory) and the pool takes
+                    # no more jobs; the jobs it held fail, later ones get a new pool.
+                    if self._executor is executor:
+                        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+                        executor.shutdown(wait=False)
+                    raise
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Error converting {job.fwf_file}: {e}")
+        latency = time.time() - submitted
+        if error is None:
+            logger.info(f"Converted {job.fwf_file} to {job.output_file} in {latency:.3f}s ({queued:.3f}s queued)")
+        return ConversionResult(job, latency, queued, error)
+
+    async def watch(
+        self,
+        input_dir: pathlib.Path,
+        spec_file: pathlib.Path,
+        output_dir: pathlib.Path,
+        output_format: str = "csv",
+        engine: str = "text",
+        pattern: str = "*.fwf",
+        poll_interval: float = 1.0,
+        on_result: Optional[Callable[[ConversionResult], None]] = None,
+    ) -> None:
+        """Converts files matching `pattern` in `input_dir` to `output_dir` until cancelled.
+
+        A file is converted once its size is unchanged between two polls, and
+        again whenever it is rewritten. Files removed while they are scanned
+        are skipped. `on_result` is called with the result of every conversion.
+        """
+        sizes: Dict[pathlib.Path, int] = {}
+        converted: Dict[pathlib.Path, int] = {}
+        tasks: Set[asyncio.Task] = set()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            while True:
+                paths = sorted(input_dir.glob(pattern))
+                for path in paths:
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    if converted.get(path) == stat.st_mtime_ns:
+                        continue
+                    if sizes.get(path) != stat.st_size:
+                        sizes[path] = stat.st_size
+                        continue
+                    converted[path] = stat.st_mtime_ns
+                    job = ConversionJob(
+                        spec_file, path, output_dir / (path.stem + _EXTENSIONS_BY_FORMAT[output_format]),
+                        output_format, engine,
+                    )
+                    task = asyncio.create_task(self.convert(job))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    if on_result is not None:
+                        task.add_done_callback(lambda done: done.cancelled() or on_result(done.result()))
+                # Forget files that no longer exist, so the state does not grow.
+                found = set(paths)
+                sizes = {path: size for path, size in sizes.items() if path in found}
+                converted = {path: mtime for path, mtime in converted.items() if path in found}
+                await asyncio.sleep(poll_interval)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def start_server(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """Serves conversion requests, one JSON object per line, on a TCP socket.
+
+        A request has the keys `spec_file`, `fwf_file`, `output_file` and the
+        optional `id`, `format`, `engine` and `columns`. Requests on a
+        connection run concurrently and each is answered when it completes,
+        with a line holding `ConversionResult.to_json` and the request's `id`.
+        A line longer than the stream limit (64 KiB) is answered as invalid.
+        `port` 0 picks a free port.
+        """
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks: Set[asyncio.Task] = set()
+        lock = asyncio.Lock()
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError as e:
+                    await _discard_line(reader, e.consumed)
+                    await _respond({"error": "Invalid request: line too long", "id": None}, writer, lock)
+                    continue
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._answer(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            # Requests still running are answered before the connection closes.
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            job = _parse_request(request)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            response = {"error": f"Invalid request: {e}"}
+        else:
+            response = (await self.convert(job)).to_json()
+        response["id"] = request_id
+        await _respond(response, writer, lock)
+
+async def _respond(response: Dict, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+    async with lock:
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+async def _discard_line(reader: asyncio.StreamReader, buffered: int) -> None:
+    """Skips a line longer than the reader's limit, of which `buffered` bytes have arrived."""
+    while True:
+        await reader.read(buffered)
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.IncompleteReadError:
+            return
+        except asyncio.LimitOverrunError as e:
+            buffered = e.consumed
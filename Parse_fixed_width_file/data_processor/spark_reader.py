@@ -0,0 +1,173 @@
+import logging
+import pathlib
+import re
+from typing import List, Optional
+
+from pyspark.sql import Column, DataFrame, SparkSession
+from pyspark.sql import functions as F
+from pyspark.sql.types import DecimalType
+
+from data_processor.data_processor import (
+    CSVSpec, FWFColumnSpec, FWFSpec, _create_fwf_header, _decimal_scale, select_fwf_columns
+)
+
+logger = logging.getLogger(__name__)
+
+# Encodings of the text source's values, which hold the raw bytes of a line.
+_TEXT_SOURCE_ENCODINGS = {"utf-8", "utf8", "ascii", "us-ascii"}
+
+# Leading or trailing characters removed by str.strip: Unicode white space
+# and the information separators U+001C..U+001F.
+_STRIP_PATTERN = r"(?U)^[\s\x1c-\x1f]+|[\s\x1c-\x1f]+$"
+
+_JAVA_DATE_PATTERNS = {
+    "%Y": "yyyy", "%y": "yy", "%m": "MM", "%d": "dd", "%b": "MMM", "%j": "DDD",
+    "%H": "HH", "%M": "mm", "%S": "ss", "%%": "%",
+}
+
+def _java_date_pattern(fmt: str) -> str:
+    """Translates a strftime format to a Spark datetime pattern."""
+    def translate(match: re.Match) -> str:
+        directive = match.group(0)
+        if directive.startswith("%"):
+            if directive not in _JAVA_DATE_PATTERNS:
+                raise ValueError(f"Date format directive {directive} is not supported by the Spark reader")
+            return _JAVA_DATE_PATTERNS[directive]
+        return f"'{directive}'" if directive.isalpha() else directive
+    return re.sub(r"%.|[A-Za-z]+|[^%A-Za-z]+", translate, fmt)
+
+def _typed_column(column_spec: FWFColumnSpec, value: Column) -> Column:
+    """Converts a stripped column to its declared data type; empty fields become null."""
+    if column_spec.dtype == "str":
+        return value
+    if column_spec.dtype == "int":
+        converted = value.cast("bigint")
+    elif column_spec.dtype == "float":
+        converted = value.cast("double")
+    elif column_spec.dtype == "decimal":
+        converted = value.cast(DecimalType(38, _decimal_scale(column_spec)))
+    elif column_spec.dtype == "date":
+        converted = F.to_date(value, _java_date_pattern(column_spec.fmt or "%Y-%m-%d"))
+    else:
+        raise ValueError(f"Unexpected datatype {column_spec.dtype} for column {column_spec.name}")
+    return F.when(value == "", F.lit(None)).otherwise(converted)
+
+def fwf_columns(spec: FWFSpec, typed: bool = False) -> List[Column]:
+    """Builds one `substring` expression per column of `spec` over the line column `value`.
+
+    Values are stripped of white space like `parse_fwf_file`; with `typed`
+    they are converted to their declared data types.
+    """
+    columns = []
+    for col in spec.columns:
+        value = F.regexp_replace(F.substring(F.col("value"), col.offset + 1, col.length), _STRIP_PATTERN, "")
+        columns.append((_typed_column(col, value) if typed else value).alias(col.name))
+    return columns
+
+def _decoded_line(spec: FWFSpec) -> Column:
+    """Decodes the `value` of the text source in the spec's encoding.
+
+    The text source keeps every line, blank ones included, and its values
+    hold the undecoded bytes, so a cast to binary gives them back.
+    """
+    if spec.encoding.lower() in _TEXT_SOURCE_ENCODINGS:
+        return F.col("value")
+    return F.decode(F.col("value").cast("binary"), spec.encoding)
+
+def _drop_header_lines(lines: DataFrame, value: Column, header: str) -> DataFrame:
+    """Drops the first line of every file of the text source `lines` and
+    returns the other lines as `value`.
+
+    A file's first line is the first row read from its block at offset 0;
+    row ids only increase within a partition, so it has the smallest id of
+    the header-valued rows of that block. Data records equal to the header
+    text are kept.
+    """
+    lines = lines.select(
+        value.alias("value"),
+        F.col("_metadata.file_path").alias("_file"),
+        F.col("_metadata.file_block_start").alias("_block_start"),
+        F.monotonically_increasing_id().alias("_row"),
+    )
+    # The header side gets new column names, otherwise the self-join
+    # condition would compare every column with itself.
+    headers = (lines
+               .filter((F.col("_block_start") == 0) & (F.regexp_replace("value", _STRIP_PATTERN, "") == header))
+               .groupBy(F.col("_file").alias("_header_file"))
+               .agg(F.min("_row").alias("_header_row")))
+    condition = (lines["_file"] == headers["_header_file"]) & (lines["_row"] == headers["_header_row"])
+    return lines.join(F.broadcast(headers), condition, "left_anti").select("value")
+
+def read_fwf(
+    spark: SparkSession,
+    spec: FWFSpec,
+    input_path: pathlib.Path,
+    typed: bool = False,
+    columns: Optional[List[str]] = None,
+) -> DataFrame:
+    """Reads FWF files into a DataFrame with one column per spec column.
+
+    `input_path` may be a file, a directory or a glob. The first line of
+    every file is dropped when `spec.header` is set.
+    `columns` projects the output onto the named columns.
+    """
+    try:
+        lines = spark.read.text(str(input_path))
+        if spec.header:
+            lines = _drop_header_lines(lines, _decoded_line(spec), _create_fwf_header(spec).strip())
+        else:
+            lines = lines.select(_decoded_line(spec).alias("value"))
+        return lines.select(*fwf_columns(select_fwf_columns(spec, columns), typed))
+    except Exception as e:
+        logger.error(f"Error reading FWF file with Spark: {e}")
+        raise
+
+def write_spark_output(
+    df: DataFrame,
+    spec: CSVSpec,
+    output_path: pathlib.Path,
+    output_format: str = "csv",
+) -> None:
+    """Writes a DataFrame as a directory of CSV or Parquet part files.
+
+    Columns are named by `spec.column_names`; the header, encoding, delimiter
+    and quote character only apply to CSV.
+    """
+    try:
+        df = df.toDF(*spec.column_names)
+        writer = df.write.mode("overwrite")
+        if output_format == "csv":
+            (writer
+             .option("header", spec.header)
+             .option("encoding", spec.encoding)
+             .option("sep", spec.delimiter)
+             .option("quote", spec.quotechar)
+             .option("escape", spec.quotechar)
+             .option("emptyValue", "")
+             .option("ignoreLeadingWhiteSpace", False)
+             .option("ignoreTrailingWhiteSpace", False)
+             .csv(str(output_path)))
+        elif output_format == "parquet":
+            writer.parquet(str(output_path))
+        else:
+            raise ValueError(f"Unexpected output format {output_format}")
+    except Exception as e:
+        logger.error(f"Error writing {output_format} output with Spark: {e}")
+        raise
+
+def convert_fwf_file_spark(
+    spark: SparkSession,
+    fwf_spec: FWFSpec,
+    csv_spec: CSVSpec,
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    output_format: str = "csv",
+    columns: Optional[List[str]] = None,
+) -> None:
+    """Converts FWF files to a directory of CSV or Parquet part files with Spark.
+
+    Parquet keeps the declared data types; CSV writes the stripped values.
+    `csv_spec` must already describe the projected columns.
+    """
+    df = read_fwf(spark, fwf_spec, input_path, typed=output_format != "csv", columns=columns)
+    write_spark_output(df, csv_spec, output_path, output_format)
@@ -25,13 +25,19 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "-n", type=int, required=True, help="Number of lines to generate"
     )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Random seed for reproducible output"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of worker processes generating shards of the file"
+    )
     return parser.parse_args()
 
 def main() -> int:
     args = parse_args()
     try:
         spec = load_fwf_spec_file(args.spec_file)
-        generate_fwf_file(spec, args.n, args.fwf_file)
+        generate_fwf_file(spec, args.n, args.fwf_file, seed=args.seed, workers=args.workers)
     except Exception as e:
         logger.error(f"Failed to generate FWF file: {e}")
         return 1  # Return 1 for failure
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the generate / parse / convert pipeline.
+
+Every case runs in a fresh process so its peak RSS is measured on its own.
+Results are compared with a JSON baseline, and the run fails when a case
+drops below the baseline rows/s by more than the threshold. Baselines are
+machine specific; refresh them with --update_baseline on the machine that
+runs the comparison.
+"""
+import argparse
+import json
+import logging
+import multiprocessing as mp
+import pathlib
+import random
+import string
+import sys
+import os
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_processor.data_processor import (
+    load_fwf_spec_json, load_csv_spec_json, generate_fwf_file, parse_fwf_file, write_csv_file, rnd_fwf_value
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _spec_json(column_lengths, encoding):
+    return {
+        "ColumnNames": [f"f{i + 1}" for i in range(len(column_lengths))],
+        "Offsets": column_lengths,
+        "FixedWidthEncoding": encoding,
+        "IncludeHeader": True,
+        "DelimitedEncoding": "utf-8",
+    }
+
+SPECS = {
+    "narrow_ascii": _spec_json([5, 10, 3, 8], "ascii"),
+    "wide_utf8": _spec_json([20] * 10, "utf-8"),
+    "many_columns_windows1252": _spec_json([4] * 40, "windows-1252"),
+    "few_long_columns_utf8": _spec_json([200, 150], "utf-8"),
+}
+
+# Characters drawn for the non-ASCII specs, so their cases decode and slice
+# multi-byte or non-ASCII lines; ASCII specs use the default lowercase values.
+_ALPHABETS = {
+    "utf-8": string.ascii_lowercase + "äöüßéèñçøå€–“”中文字😀",
+    "windows-1252": string.ascii_lowercase + "äöüßéèñçøå€–“”",
+}
+
+def _random_text(alphabet):
+    def value(column_spec):
+        return "".join(random.choices(alphabet, k=column_spec.length))
+    return value
+
+def _generate(spec_json, rows, fwf_file, csv_file):
+    alphabet = _ALPHABETS.get(spec_json["FixedWidthEncoding"])
+    value_generator = rnd_fwf_value if alphabet is None else _random_text(alphabet)
+    generate_fwf_file(load_fwf_spec_json(json.dumps(spec_json)), rows, fwf_file, value_generator, seed=0)
+    return fwf_file.stat().st_size
+
+def _parse(engine):
+    def parse(spec_json, rows, fwf_file, csv_file):
+        for _ in parse_fwf_file(load_fwf_spec_json(json.dumps(spec_json)), fwf_file, engine):
+            pass
+        return fwf_file.stat().st_size
+    return parse
+
+def _convert(spec_json, rows, fwf_file, csv_file):
+    spec = json.dumps(spec_json)
+    lines = parse_fwf_file(load_fwf_spec_json(spec), fwf_file, "mmap")
+    write_csv_file(load_csv_spec_json(spec), lines, csv_file)
+    return fwf_file.stat().st_size
+
+STAGES = {
+    "generate": _generate,
+    "parse_text": _parse("text"),
+    "parse_mmap": _parse("mmap"),
+    "convert_csv": _convert,
+}
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_case(spec_name, stage, rows, work_dir):
+    """Runs one case and returns its metrics; executed in a child process."""
+    work_dir = pathlib.Path(work_dir)
+    fwf_file = work_dir / f"{spec_name}.fwf"
+    if stage == "generate":
+        fwf_file = work_dir / f"{spec_name}.generated.fwf"
+    start = time.perf_counter()
+    size = STAGES[stage](SPECS[spec_name], rows, fwf_file, work_dir / f"{spec_name}.csv")
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 4),
+        "rows_per_s": round(rows / seconds, 1),
+        "mb_per_s": round(size / 1e6 / seconds, 2),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+def run_benchmarks(rows, repeat, work_dir, cases=None):
+    ctx = mp.get_context("spawn")
+    results = {}
+    for spec_name, spec_json in SPECS.items():
+        stages = [stage for stage in STAGES if not cases or f"{spec_name}/{stage}" in cases]
+        if stages:
+            _generate(spec_json, rows, pathlib.Path(work_dir) / f"{spec_name}.fwf", None)
+        for stage in stages:
+            key = f"{spec_name}/{stage}"
+            runs = []
+            for _ in range(repeat):
+                with ctx.Pool(processes=1) as pool:
+                    runs.append(pool.apply(run_case, (spec_name, stage, rows, str(work_dir))))
+            best = max(runs, key=lambda run: run["rows_per_s"])
+            best["peak_rss_mb"] = max((run["peak_rss_mb"] or 0) for run in runs) or None
+            results[key] = best
+            logger.info(f"{key}: {best['rows_per_s']:.0f} rows/s, {best['mb_per_s']:.1f} MB/s, "
+                        f"peak RSS {best['peak_rss_mb']} MB")
+    return results
+
+def find_regressions(results, baseline, threshold):
+    """Returns a message for every case slower than the baseline by more than `threshold`."""
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        floor = expected["rows_per_s"] * (1 - threshold)
+        if result["rows_per_s"] < floor:
+            regressions.append(
+                f"{key}: {result['rows_per_s']:.0f} rows/s is below {floor:.0f} "
+                f"(baseline {expected['rows_per_s']:.0f} rows/s - {threshold:.0%})"
+            )
+    return regressions
+
+def parse_args() -> argparse.Namespace:
+    """Parse user command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmarks FWF generation, parsing and CSV conversion.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--rows", type=int, default=100000, help="Number of rows per case"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per case; the fastest run is reported"
+    )
+    parser.add_argument(
+        "--baseline", type=pathlib.Path,
+        default=pathlib.Path(__file__).with_name("benchmark_baseline.json"), help="Baseline results file"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed rows/s drop relative to the baseline"
+    )
+    parser.add_argument(
+        "--update_baseline", action="store_true", help="Write the results to the baseline file"
+    )
+    parser.add_argument(
+        "--case", action="append", default=None, help="Only run the given spec/stage case; may be repeated"
+    )
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = run_benchmarks(args.rows, args.repeat, work_dir, args.case)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"rows": args.rows, "results": results}, f, indent=4, sort_keys=True)
+        logger.info(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        logger.warning(f"No baseline at {args.baseline}; run with --update_baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("rows") != args.rows:
+        logger.warning(f"Baseline was measured with {baseline.get('rows')} rows, this run used {args.rows}")
+    regressions = find_regressions(results, baseline["results"], args.threshold)
+    for regression in regressions:
+        logger.error(f"Throughput regression: {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,8 @@ import csv
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 from data_processor.data_processor import (
     load_fwf_spec_file, load_csv_spec_file, generate_fwf_file, parse_fwf_file, write_csv_file,
-    FWFSpec, CSVSpec, FWFColumnSpec
+    convert_fwf_file_parallel, split_fwf_file, parse_fwf_predicate, select_csv_columns,
+    FWFSpec, CSVSpec, FWFColumnSpec, FWFPredicate
 )
 
 class TestAdvancedDataProcessor(unittest.TestCase):
@@ -99,6 +100,123 @@ class TestAdvancedDataProcessor(unittest.TestCase):
         self.assertEqual(csv_lines[0], ["id", "name", "age", "city"])
         self.assertEqual(len(csv_lines[1]), 4)
 
+    def test_split_fwf_file_on_record_boundaries(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        fwf_file = pathlib.Path(self.temp_dir) / "test_split.fwf"
+        generate_fwf_file(fwf_spec, 10, fwf_file)
+
+        ranges = split_fwf_file(fwf_spec, fwf_file, 3)
+        record_length = sum(col.length for col in fwf_spec.columns) + 1
+        header_length = record_length  # column names fit within their widths
+        self.assertEqual(len(ranges), 3)
+        self.assertEqual(ranges[0][0], header_length)
+        self.assertEqual(ranges[-1][1], fwf_file.stat().st_size)
+        for start, end in ranges:
+            self.assertEqual((start - header_length) % record_length, 0)
+            self.assertEqual((end - header_length) % record_length, 0)
+
+    def test_convert_fwf_file_parallel_matches_serial(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        csv_spec = load_csv_spec_file(self.spec_file)
+        fwf_file = pathlib.Path(self.temp_dir) / "test_parallel.fwf"
+        serial_csv_file = pathlib.Path(self.temp_dir) / "test_serial.csv"
+        parallel_csv_file = pathlib.Path(self.temp_dir) / "test_parallel.csv"
+
+        generate_fwf_file(fwf_spec, 101, fwf_file)
+        write_csv_file(csv_spec, parse_fwf_file(fwf_spec, fwf_file), serial_csv_file)
+        convert_fwf_file_parallel(fwf_spec, csv_spec, fwf_file, parallel_csv_file, workers=4)
+
+        self.assertEqual(parallel_csv_file.read_bytes(), serial_csv_file.read_bytes())
+
+    def test_convert_fwf_file_parallel_with_cr_line_breaks(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        csv_spec = load_csv_spec_file(self.spec_file)
+        fwf_file = pathlib.Path(self.temp_dir) / "test_parallel_cr.fwf"
+        serial_csv_file = pathlib.Path(self.temp_dir) / "test_serial_cr.csv"
+        parallel_csv_file = pathlib.Path(self.temp_dir) / "test_parallel_cr.csv"
+
+        generate_fwf_file(fwf_spec, 101, fwf_file)
+        fwf_file.write_bytes(fwf_file.read_bytes().replace(b"\n", b"\r"))
+        write_csv_file(csv_spec, parse_fwf_file(fwf_spec, fwf_file), serial_csv_file)
+        self.assertEqual(len(split_fwf_file(fwf_spec, fwf_file, 4)), 4)
+        convert_fwf_file_parallel(fwf_spec, csv_spec, fwf_file, parallel_csv_file, workers=4)
+
+        self.assertEqual(parallel_csv_file.read_bytes(), serial_csv_file.read_bytes())
+
+    def _write_people_fwf(self, fwf_spec):
+        people = [("1", "anna", "31", "oslo"), ("2", "bob", "45", "bergen"),
+                  ("3", "anders", "27", "oslo"), ("4", "\u00e5se", "38", "oslo")]
+        values = iter(value for person in people for value in person)
+        fwf_file = pathlib.Path(self.temp_dir) / "people.fwf"
+        generate_fwf_file(fwf_spec, len(people), fwf_file, lambda col: next(values).ljust(col.length))
+        return fwf_file
+
+    def test_parse_fwf_file_columns_and_where(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        fwf_file = self._write_people_fwf(fwf_spec)
+
+        for engine in ("text", "mmap"):
+            with self.subTest(engine=engine):
+                lines = [list(line) for line in parse_fwf_file(
+                    fwf_spec, fwf_file, engine, columns=["name", "id"],
+                    where=[FWFPredicate("city", "eq", "oslo"), FWFPredicate("age", "range", "30", "40")])]
+                self.assertEqual(lines, [["anna", "1"], ["\u00e5se", "4"]])
+
+                lines = [list(line) for line in parse_fwf_file(
+                    fwf_spec, fwf_file, engine, columns=["id"], where=[parse_fwf_predicate("name^=an")])]
+                self.assertEqual(lines, [["1"], ["3"]])
+
+    def test_where_ranges_compare_typed_values(self):
+        self.spec_data.update({
+            "ColumnNames": ["id", "n", "day"],
+            "Offsets": [3, 5, 10],
+            "DataTypes": ["str", "int", "date"],
+            "Formats": [None, None, "%d/%m/%Y"],
+        })
+        with open(self.spec_file, "w") as f:
+            json.dump(self.spec_data, f)
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        rows = [("a", "9", "31/01/2024"), ("b", "20", "01/02/2023"), ("c", "100", "15/01/2024"), ("d", "", "")]
+        values = iter(value for row in rows for value in row)
+        fwf_file = pathlib.Path(self.temp_dir) / "typed.fwf"
+        generate_fwf_file(fwf_spec, len(rows), fwf_file, lambda col: next(values).ljust(col.length))
+
+        for engine in ("text", "mmap"):
+            with self.subTest(engine=engine):
+                def ids(*expressions):
+                    where = [parse_fwf_predicate(expression) for expression in expressions]
+                    return [row[0] for row in parse_fwf_file(fwf_spec, fwf_file, engine, columns=["id"], where=where)]
+
+                self.assertEqual(ids("n>=20"), ["b", "c"])
+                self.assertEqual(ids("n<=20"), ["a", "b"])
+                self.assertEqual(ids("day>=01/01/2024", "day<=20/01/2024"), ["c"])
+
+        csv_spec = select_csv_columns(fwf_spec, load_csv_spec_file(self.spec_file), ["id"])
+        csv_file = pathlib.Path(self.temp_dir) / "typed.csv"
+        convert_fwf_file_parallel(fwf_spec, csv_spec, fwf_file, csv_file, workers=2,
+                                  columns=["id"], where=[parse_fwf_predicate("n>=20")])
+        with open(csv_file, "r", newline='') as f:
+            self.assertEqual(list(csv.reader(f)), [["id"], ["b"], ["c"]])
+
+    def test_convert_fwf_file_parallel_columns_and_where(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        csv_spec = select_csv_columns(fwf_spec, load_csv_spec_file(self.spec_file), ["city", "name"])
+        fwf_file = self._write_people_fwf(fwf_spec)
+        csv_file = pathlib.Path(self.temp_dir) / "people.csv"
+
+        convert_fwf_file_parallel(fwf_spec, csv_spec, fwf_file, csv_file, workers=2,
+                                  columns=["city", "name"], where=[parse_fwf_predicate("age<=31")])
+
+        with open(csv_file, "r", newline='') as f:
+            self.assertEqual(list(csv.reader(f)), [["city", "name"], ["oslo", "anna"], ["oslo", "anders"]])
+
+    def test_parse_fwf_predicate(self):
+        self.assertEqual(parse_fwf_predicate("city=oslo"), FWFPredicate("city", "eq", "oslo"))
+        self.assertEqual(parse_fwf_predicate("age>=30"), FWFPredicate("age", "range", value="30"))
+        self.assertEqual(parse_fwf_predicate("age<=40"), FWFPredicate("age", "range", high="40"))
+        with self.assertRaises(ValueError):
+            parse_fwf_predicate("city")
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -10,7 +10,7 @@ import string
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 from data_processor.data_processor import (
-    load_fwf_spec_file, load_csv_spec_file, generate_fwf_file, parse_fwf_file, write_csv_file,
+    load_fwf_spec_file, load_csv_spec_file, generate_fwf_file, parse_fwf_file, parse_fwf_batches, write_csv_file,
     FWFSpec, CSVSpec, FWFColumnSpec
 )
 
@@ -125,5 +125,60 @@ class TestComplexDataProcessor(unittest.TestCase):
             content = f.readlines()
         self.assertEqual(len(content), 2)  # Header + 1 data line
 
+    def test_mmap_engine_matches_text_engine(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        fwf_file = pathlib.Path(self.temp_dir) / "test_mmap.fwf"
+        generate_fwf_file(fwf_spec, 50, fwf_file)
+
+        text_lines = [list(line) for line in parse_fwf_file(fwf_spec, fwf_file)]
+        mmap_lines = [list(line) for line in parse_fwf_file(fwf_spec, fwf_file, "mmap")]
+        self.assertEqual(len(mmap_lines), 50)
+        self.assertEqual(mmap_lines, text_lines)
+
+    def test_mmap_engine_multibyte_characters(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        fwf_file = pathlib.Path(self.temp_dir) / "test_mmap_utf8.fwf"
+        generate_fwf_file(fwf_spec, 10, fwf_file, lambda col: ("\u00e9" * col.length))
+
+        text_lines = [list(line) for line in parse_fwf_file(fwf_spec, fwf_file)]
+        mmap_lines = [list(line) for line in parse_fwf_file(fwf_spec, fwf_file, "mmap")]
+        self.assertEqual(mmap_lines, text_lines)
+        self.assertEqual(mmap_lines[0][0], "\u00e9" * 10)
+
+    def test_struct_path_single_byte_encodings(self):
+        fwf_spec = FWFSpec(
+            columns=[FWFColumnSpec("a", 0, 4), FWFColumnSpec("b", 4, 6), FWFColumnSpec("c", 10, 3)],
+            header=True,
+            encoding="windows-1252",
+        )
+        records = [["é€ a", "b\u00a0 ", "xyz"], ["", "bb", "z"], ["aaaa", "bbbbbb", "ccc"]] * 5
+        lines = ["".join(value.ljust(col.length) for value, col in zip(record, fwf_spec.columns))
+                 for record in records]
+        expected = [[value.strip() for value in record] for record in records]
+        files = {
+            "lf": "\n".join(["a   b     c  "] + lines) + "\n",
+            "no_last_newline": "\n".join(["a   b     c  "] + lines),
+            "crlf": "\r\n".join(["a   b     c  "] + lines) + "\r\n",
+            "cr": "\r".join(["a   b     c  "] + lines) + "\r",
+            "short_line": "\n".join(["a   b     c  "] + lines[:4] + ["a"] + lines[4:]) + "\n",
+        }
+        for name, content in files.items():
+            fwf_file = pathlib.Path(self.temp_dir) / f"struct_{name}.fwf"
+            fwf_file.write_bytes(content.encode(fwf_spec.encoding))
+            rows = expected if name != "short_line" else expected[:4] + [["a", "", ""]] + expected[4:]
+            for batch_size in (1, 4, 100):
+                with self.subTest(file=name, batch_size=batch_size):
+                    batches = parse_fwf_batches(fwf_spec, fwf_file, batch_size=batch_size)
+                    self.assertEqual([list(row) for columns in batches for row in zip(*columns)], rows)
+                    projected = parse_fwf_file(fwf_spec, fwf_file, columns=["c", "a"], batch_size=batch_size)
+                    self.assertEqual(list(projected), [[row[2], row[0]] for row in rows])
+                    mmap_rows = parse_fwf_file(fwf_spec, fwf_file, "mmap", batch_size=batch_size)
+                    self.assertEqual([list(row) for row in mmap_rows], rows)
+
+    def test_parse_unknown_engine(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        with self.assertRaises(ValueError):
+            list(parse_fwf_file(fwf_spec, pathlib.Path(self.temp_dir) / "missing.fwf", "unknown"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -4,10 +4,15 @@ import pathlib
 import json
 import sys
 import os
+import datetime
+import decimal
+import pickle
+import string
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 from data_processor.data_processor import (
-    load_fwf_spec_file, load_csv_spec_file, generate_fwf_file, parse_fwf_file, write_csv_file
+    load_fwf_spec_file, load_csv_spec_file, generate_fwf_file, parse_fwf_file, write_csv_file,
+    compile_fwf_spec, select_fwf_columns, CompiledFWFSpec
 )
 
 class TestDataProcessor(unittest.TestCase):
@@ -61,5 +66,139 @@ class TestDataProcessor(unittest.TestCase):
         self.assertIn("f1,f2,f3", csv_content)  # Check header
         self.assertEqual(len(csv_content.splitlines()), 11)  # 10 data lines + 1 header
 
+    def test_generate_and_parse_typed_columns(self):
+        spec_data = dict(self.spec_data,
+                         ColumnNames=["id", "amount", "price", "day"],
+                         Offsets=[6, 9, 8, 10],
+                         DataTypes=["int", "float", "decimal", "date"],
+                         Formats=[None, ".3f", ".2f", "%d/%m/%Y"])
+        spec_file = pathlib.Path(self.temp_dir) / "typed_spec.json"
+        with open(spec_file, "w") as f:
+            json.dump(spec_data, f)
+
+        fwf_spec = load_fwf_spec_file(spec_file)
+        self.assertEqual(fwf_spec.columns[3].dtype, "date")
+        self.assertEqual(fwf_spec.columns[3].fmt, "%d/%m/%Y")
+
+        fwf_file = pathlib.Path(self.temp_dir) / "typed.fwf"
+        generate_fwf_file(fwf_spec, 25, fwf_file)
+
+        raw_lines = [list(line) for line in parse_fwf_file(fwf_spec, fwf_file)]
+        typed_lines = [list(line) for line in parse_fwf_file(fwf_spec, fwf_file, typed=True, batch_size=7)]
+        self.assertEqual(len(typed_lines), 25)
+        for raw, typed in zip(raw_lines, typed_lines):
+            self.assertEqual(typed[0], int(raw[0]))
+            self.assertEqual(typed[1], float(raw[1]))
+            self.assertEqual(typed[2], decimal.Decimal(raw[2]))
+            self.assertEqual(typed[3], datetime.datetime.strptime(raw[3], "%d/%m/%Y").date())
+
+    def test_parse_typed_empty_values(self):
+        spec_data = dict(self.spec_data, DataTypes=["int", "str", "date"])
+        spec_file = pathlib.Path(self.temp_dir) / "typed_empty_spec.json"
+        with open(spec_file, "w") as f:
+            json.dump(spec_data, f)
+
+        fwf_spec = load_fwf_spec_file(spec_file)
+        fwf_file = pathlib.Path(self.temp_dir) / "typed_empty.fwf"
+        generate_fwf_file(fwf_spec, 3, fwf_file, lambda col: " " * col.length)
+
+        typed_lines = [list(line) for line in parse_fwf_file(fwf_spec, fwf_file, typed=True)]
+        self.assertEqual(typed_lines, [[None, "", None]] * 3)
+
+    def test_load_fwf_spec_unknown_datatype(self):
+        spec_data = dict(self.spec_data, DataTypes=["int", "str", "blob"])
+        spec_file = pathlib.Path(self.temp_dir) / "bad_type_spec.json"
+        with open(spec_file, "w") as f:
+            json.dump(spec_data, f)
+
+        with self.assertRaises(ValueError):
+            load_fwf_spec_file(spec_file)
+
+    def test_load_fwf_spec_decimal_requires_scale(self):
+        for formats in (None, [None, None, None], [None, None, "%s"]):
+            with self.subTest(formats=formats):
+                spec_data = dict(self.spec_data, DataTypes=["int", "str", "decimal"], Formats=formats)
+                spec_file = pathlib.Path(self.temp_dir) / "decimal_spec.json"
+                with open(spec_file, "w") as f:
+                    json.dump(spec_data, f)
+                with self.assertRaisesRegex(ValueError, "requires a format"):
+                    load_fwf_spec_file(spec_file)
+
+    def test_generate_fwf_file_seeded_blocks(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        first_file = pathlib.Path(self.temp_dir) / "seeded_1.fwf"
+        second_file = pathlib.Path(self.temp_dir) / "seeded_2.fwf"
+        other_file = pathlib.Path(self.temp_dir) / "seeded_3.fwf"
+
+        generate_fwf_file(fwf_spec, 25, first_file, seed=42, block_size=7)
+        generate_fwf_file(fwf_spec, 25, second_file, seed=42, block_size=7)
+        generate_fwf_file(fwf_spec, 25, other_file, seed=43, block_size=7)
+
+        self.assertEqual(first_file.read_bytes(), second_file.read_bytes())
+        self.assertNotEqual(first_file.read_bytes(), other_file.read_bytes())
+
+        lines = first_file.read_text().splitlines()
+        self.assertEqual(len(lines), 26)
+        self.assertEqual(lines[0], "f1   f2     f3 ")
+        for line in lines[1:]:
+            self.assertEqual(len(line), 15)
+            self.assertTrue(line.isalpha() and line.islower())
+
+    def test_generate_fwf_file_letters_are_uniform(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        fwf_file = pathlib.Path(self.temp_dir) / "uniform.fwf"
+        generate_fwf_file(fwf_spec, 20000, fwf_file, seed=1)
+
+        letters = "".join(fwf_file.read_text().splitlines()[1:])
+        counts = [letters.count(letter) for letter in string.ascii_lowercase]
+        # A byte-modulo draw gives "w".."z" 9/10 of the other letters' share.
+        for count in counts:
+            self.assertAlmostEqual(count / len(letters), 1 / 26, delta=0.05 / 26)
+
+    def test_generate_fwf_file_workers_reproducible(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        serial_file = pathlib.Path(self.temp_dir) / "serial.fwf"
+        parallel_file = pathlib.Path(self.temp_dir) / "parallel.fwf"
+
+        generate_fwf_file(fwf_spec, 103, serial_file, seed=7, block_size=10)
+        generate_fwf_file(fwf_spec, 103, parallel_file, seed=7, block_size=10, workers=3)
+
+        self.assertEqual(parallel_file.read_bytes(), serial_file.read_bytes())
+        self.assertEqual(len(parallel_file.read_text().splitlines()), 104)
+
+    def test_compile_fwf_spec(self):
+        compiled = compile_fwf_spec(load_fwf_spec_file(self.spec_file))
+        self.assertIs(compile_fwf_spec(load_fwf_spec_file(self.spec_file)), compiled)
+        self.assertIs(compile_fwf_spec(compiled), compiled)
+        self.assertEqual(compiled.slices, (slice(0, 5), slice(5, 12), slice(12, 15)))
+        self.assertEqual(compiled.record_length, 15)
+        self.assertEqual(compiled.header_bytes, b"f1   f2     f3 \n")
+        self.assertEqual(compiled.codec.name, "utf-8")
+        self.assertIsNone(compiled.record_struct)
+
+        self.spec_data["FixedWidthEncoding"] = "windows-1252"
+        with open(self.spec_file, "w") as f:
+            json.dump(self.spec_data, f)
+        compiled = compile_fwf_spec(load_fwf_spec_file(self.spec_file))
+        self.assertEqual(compiled.record_struct.format, "5s7s3sx")
+        self.assertIsNone(compile_fwf_spec(select_fwf_columns(compiled, ["f3", "f1"])).record_struct)
+        record, unpacked = compiled.projection_struct(["f3", "f1"])
+        self.assertEqual((record.format, unpacked), ("5s7x3sx", ("f1", "f3")))
+        self.assertIs(compiled.projection_struct(["f3", "f1"])[0], record)
+
+    def test_compiled_spec_accepted(self):
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        compiled = compile_fwf_spec(fwf_spec)
+        self.assertIsInstance(compiled, CompiledFWFSpec)
+        fwf_file = pathlib.Path(self.temp_dir) / "compiled.fwf"
+        compiled_file = pathlib.Path(self.temp_dir) / "compiled_2.fwf"
+        generate_fwf_file(fwf_spec, 30, fwf_file, seed=3)
+        generate_fwf_file(compiled, 30, compiled_file, seed=3)
+        self.assertEqual(fwf_file.read_bytes(), compiled_file.read_bytes())
+        self.assertIs(pickle.loads(pickle.dumps(compiled)), compiled)
+        for engine in ("text", "mmap"):
+            self.assertEqual(list(parse_fwf_file(compiled, fwf_file, engine, columns=["f2"])),
+                             list(parse_fwf_file(fwf_spec, fwf_file, engine, columns=["f2"])))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
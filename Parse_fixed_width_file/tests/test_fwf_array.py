@@ -0,0 +1,70 @@
+import unittest
+import tempfile
+import pathlib
+import json
+import sys
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_processor.data_processor import load_fwf_spec_file, generate_fwf_file, parse_fwf_file
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestFWFArray(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spec_data = {
+            "ColumnNames": ["id", "name", "age", "city"],
+            "Offsets": [5, 20, 3, 15],
+            "FixedWidthEncoding": "windows-1252",
+            "IncludeHeader": True,
+            "DelimitedEncoding": "utf-8"
+        }
+        self.spec_file = pathlib.Path(self.temp_dir) / "array_spec.json"
+        with open(self.spec_file, "w") as f:
+            json.dump(self.spec_data, f)
+
+    def test_fwf_spec_to_dtype(self):
+        from data_processor.fwf_array import fwf_spec_to_dtype
+
+        dtype = fwf_spec_to_dtype(load_fwf_spec_file(self.spec_file))
+        self.assertEqual(dtype.names, ("id", "name", "age", "city"))
+        self.assertEqual(dtype.fields["age"], (numpy.dtype("S3"), 25))
+        self.assertEqual(dtype.itemsize, 44)
+
+    def test_read_fwf_array_matches_parse_fwf_file(self):
+        from data_processor.fwf_array import read_fwf_array, decode_fwf_column
+
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        fwf_file = pathlib.Path(self.temp_dir) / "test_array.fwf"
+        generate_fwf_file(fwf_spec, 20, fwf_file)
+
+        records = read_fwf_array(fwf_spec, fwf_file)
+        expected = [list(line) for line in parse_fwf_file(fwf_spec, fwf_file)]
+        self.assertEqual(len(records), 20)
+        for i, col in enumerate(fwf_spec.columns):
+            self.assertEqual(decode_fwf_column(fwf_spec, records, col.name).tolist(),
+                             [line[i] for line in expected])
+
+        block = read_fwf_array(fwf_spec, fwf_file, start_row=5, num_rows=10)
+        self.assertEqual(len(block), 10)
+        self.assertEqual(decode_fwf_column(fwf_spec, block, "name").tolist(),
+                         [line[1] for line in expected[5:15]])
+
+    def test_read_fwf_array_rejects_variable_length_records(self):
+        from data_processor.fwf_array import read_fwf_array
+
+        fwf_spec = load_fwf_spec_file(self.spec_file)
+        fwf_spec.encoding = "utf-8"
+        fwf_file = pathlib.Path(self.temp_dir) / "test_array_utf8.fwf"
+        generate_fwf_file(fwf_spec, 5, fwf_file, lambda col: "\u00e9" * col.length)
+
+        with self.assertRaises(ValueError):
+            read_fwf_array(fwf_spec, fwf_file)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import asyncio
+import tempfile
+import pathlib
+import json
+import csv
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_processor.data_processor import load_fwf_spec_file, generate_fwf_file, parse_fwf_file
+from data_processor import service as service_module
+from data_processor.service import ConversionJob, ConversionService, SpecCache
+
+def _exit_worker(*args):
+    os._exit(1)
+
+class TestConversionService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = pathlib.Path(tempfile.mkdtemp())
+        self.spec_file = self.temp_dir / "service_spec.json"
+        with open(self.spec_file, "w") as f:
+            json.dump({
+                "ColumnNames": ["f1", "f2", "f3"],
+                "Offsets": [5, 12, 3],
+                "FixedWidthEncoding": "windows-1252",
+                "IncludeHeader": True,
+                "DelimitedEncoding": "utf-8"
+            }, f)
+        self.fwf_spec = load_fwf_spec_file(self.spec_file)
+
+    def _generate(self, path: pathlib.Path, lines: int) -> pathlib.Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        generate_fwf_file(self.fwf_spec, lines, path)
+        return path
+
+    def _assert_converted(self, fwf_file: pathlib.Path, csv_file: pathlib.Path):
+        with open(csv_file, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["f1", "f2", "f3"])
+        self.assertEqual(rows[1:], [list(row) for row in parse_fwf_file(self.fwf_spec, fwf_file)])
+
+    def test_spec_cache_reloads_changed_spec(self):
+        cache = SpecCache()
+        fwf_spec, csv_spec = cache.get(self.spec_file)
+        self.assertIs(cache.get(self.spec_file)[0], fwf_spec)
+
+        stat = self.spec_file.stat()
+        os.utime(self.spec_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNot(cache.get(self.spec_file)[0], fwf_spec)
+        self.assertEqual(cache.get(self.spec_file)[1], csv_spec)
+
+    async def test_convert_reports_errors(self):
+        async with ConversionService(workers=1) as service:
+            job = ConversionJob(self.spec_file, self.temp_dir / "missing.fwf", self.temp_dir / "missing.csv")
+            result = await service.convert(job)
+        self.assertIsNotNone(result.error)
+        self.assertGreaterEqual(result.latency, 0)
+
+    async def test_convert_replaces_a_broken_pool(self):
+        fwf_file = self._generate(self.temp_dir / "broken.fwf", 20)
+        job = ConversionJob(self.spec_file, fwf_file, fwf_file.with_suffix(".csv"))
+        async with ConversionService(workers=1) as service:
+            with mock.patch.object(service_module, "_convert_job", _exit_worker):
+                result = await service.convert(job)
+            self.assertIsNotNone(result.error)
+            result = await service.convert(job)
+        self.assertIsNone(result.error)
+        self._assert_converted(fwf_file, fwf_file.with_suffix(".csv"))
+
+    async def test_watch_directory(self):
+        input_dir = self.temp_dir / "input"
+        output_dir = self.temp_dir / "output"
+        fwf_files = [self._generate(input_dir / f"drop{i}.fwf", 50 + i) for i in range(3)]
+        self._generate(input_dir / "ignored.txt", 5)
+        (input_dir / "dangling.fwf").symlink_to(input_dir / "missing.fwf")
+
+        results = []
+        async with ConversionService(workers=2) as service:
+            watcher = asyncio.create_task(service.watch(
+                input_dir, self.spec_file, output_dir, poll_interval=0.05, on_result=results.append
+            ))
+            try:
+                for _ in range(200):
+                    if len(results) == 3:
+                        break
+                    await asyncio.sleep(0.05)
+            finally:
+                watcher.cancel()
+
+        self.assertEqual(sorted(result.job.fwf_file for result in results), fwf_files)
+        self.assertTrue(all(result.error is None for result in results))
+
+        self.assertEqual(sorted(p.name for p in output_dir.iterdir()), ["drop0.csv", "drop1.csv", "drop2.csv"])
+        for fwf_file in fwf_files:
+            self._assert_converted(fwf_file, output_dir / (fwf_file.stem + ".csv"))
+
+    async def test_socket_requests(self):
+        fwf_files = [self._generate(self.temp_dir / f"socket{i}.fwf", 20) for i in range(2)]
+        async with ConversionService(workers=2) as service:
+            server = await service.start_server("127.0.0.1", 0)
+            async with server:
+                host, port = server.sockets[0].getsockname()[:2]
+                reader, writer = await asyncio.open_connection(host, port)
+                for i, fwf_file in enumerate(fwf_files):
+                    request = {"id": i, "spec_file": str(self.spec_file), "fwf_file": str(fwf_file),
+                               "output_file": str(fwf_file.with_suffix(".csv"))}
+                    writer.write(json.dumps(request).encode() + b"\n")
+                writer.write(b"not json\n")
+                await writer.drain()
+                # The invalid request does not wait for the conversions sent before it.
+                responses = [json.loads(await reader.readline()) for _ in range(3)]
+                writer.close()
+                await writer.wait_closed()
+
+        self.assertIn("Invalid request", responses[0]["error"])
+        self.assertIsNone(responses[0]["id"])
+        by_id = {response["id"]: response for response in responses[1:]}
+        for i, fwf_file in enumerate(fwf_files):
+            response = by_id[i]
+            self.assertIsNone(response["error"])
+            self.assertEqual(response["output_file"], str(fwf_file.with_suffix(".csv")))
+            self.assertGreaterEqual(response["latency"], response["queued"])
+            self._assert_converted(fwf_file, fwf_file.with_suffix(".csv"))
+
+    async def test_socket_request_longer_than_limit(self):
+        async with ConversionService(workers=1) as service:
+            server = await service.start_server("127.0.0.1", 0)
+            async with server:
+                host, port = server.sockets[0].getsockname()[:2]
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.write(b"x" * 200_000 + b"\n" + json.dumps({"id": 1}).encode() + b"\n")
+                await writer.drain()
+                responses = [json.loads(await reader.readline()) for _ in range(2)]
+                writer.close()
+                await writer.wait_closed()
+
+        self.assertEqual(responses[0], {"error": "Invalid request: line too long", "id": None})
+        self.assertIn("Invalid request", responses[1]["error"])
+        self.assertEqual(responses[1]["id"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import tempfile
+import pathlib
+import datetime
+import csv
+import json
+import sys
+import os
+
+try:
+    import pyspark
+except ImportError:
+    pyspark = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_processor.data_processor import (
+    load_fwf_spec_file, load_csv_spec_file, generate_fwf_file, parse_fwf_file, select_csv_columns
+)
+
+@unittest.skipIf(pyspark is None, "pyspark is not installed")
+class TestSparkReader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from pyspark.sql import SparkSession
+
+        try:
+            cls.spark = SparkSession.builder.master("local[*]").appName("TestSparkReader").getOrCreate()
+        except Exception as e:
+            # pyspark is installed but cannot start a JVM, e.g. without Java.
+            raise unittest.SkipTest(f"Spark session cannot start: {e}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.spark.stop()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spec_data = {
+            "ColumnNames": ["id", "name", "amount", "day", "city"],
+            "Offsets": [6, 12, 9, 10, 8],
+            "DataTypes": ["int", "str", "decimal", "date", "str"],
+            "Formats": [None, None, ".2f", "%d/%m/%Y", None],
+            "FixedWidthEncoding": "utf-8",
+            "IncludeHeader": True,
+            "DelimitedEncoding": "utf-8"
+        }
+
+    def _load_specs(self, **overrides):
+        self.spec_data.update(overrides)
+        spec_file = pathlib.Path(self.temp_dir) / "spark_spec.json"
+        with open(spec_file, "w") as f:
+            json.dump(self.spec_data, f)
+        return load_fwf_spec_file(spec_file), load_csv_spec_file(spec_file)
+
+    def test_read_fwf_matches_parse_fwf_file(self):
+        from data_processor.spark_reader import read_fwf
+
+        for encoding in ("utf-8", "windows-1252"):
+            with self.subTest(encoding=encoding):
+                fwf_spec, _ = self._load_specs(FixedWidthEncoding=encoding)
+                fwf_file = pathlib.Path(self.temp_dir) / f"spark_{encoding}.fwf"
+                generate_fwf_file(fwf_spec, 200, fwf_file, seed=1)
+
+                for typed in (False, True):
+                    rows = [tuple(row) for row in read_fwf(self.spark, fwf_spec, fwf_file, typed=typed).collect()]
+                    self.assertEqual(rows, [tuple(row) for row in parse_fwf_file(fwf_spec, fwf_file, typed=typed)])
+
+    def test_whitespace_and_blank_records_match_parse_fwf_file(self):
+        from data_processor.spark_reader import read_fwf
+
+        records = [("7", "\tann\t", "12.345", "01/02/2024", "\u00a0oslo"), ("", "", "", "", ""),
+                   ("8", "b\u00e9b", "1.5", "", "x\x1f")]
+        for encoding in ("utf-8", "windows-1252"):
+            with self.subTest(encoding=encoding):
+                fwf_spec, _ = self._load_specs(FixedWidthEncoding=encoding,
+                                               Formats=[None, None, ".3f", "%d/%m/%Y", None])
+                values = iter(value for record in records for value in record)
+                fwf_file = pathlib.Path(self.temp_dir) / f"spark_blank_{encoding}.fwf"
+                generate_fwf_file(fwf_spec, len(records), fwf_file, lambda col: next(values).ljust(col.length))
+
+                for typed in (False, True):
+                    rows = [tuple(row) for row in read_fwf(self.spark, fwf_spec, fwf_file, typed=typed).collect()]
+                    self.assertEqual(rows, [tuple(row) for row in parse_fwf_file(fwf_spec, fwf_file, typed=typed)])
+                    self.assertEqual(len(rows), 3)
+
+    def test_typed_empty_values_are_null(self):
+        from data_processor.spark_reader import read_fwf
+
+        fwf_spec, _ = self._load_specs()
+        fwf_file = pathlib.Path(self.temp_dir) / "spark_empty.fwf"
+        generate_fwf_file(fwf_spec, 3, fwf_file, lambda col: "é" * col.length if col.dtype == "str" else "")
+
+        rows = read_fwf(self.spark, fwf_spec, fwf_file, typed=True, columns=["name", "amount", "day"]).collect()
+        self.assertEqual([tuple(row) for row in rows], [("é" * 12, None, None)] * 3)
+
+    def test_records_equal_to_the_header_are_kept(self):
+        from data_processor.spark_reader import read_fwf
+
+        fwf_spec, _ = self._load_specs(DataTypes=["str"] * 5, Formats=[None] * 5)
+        fwf_dir = pathlib.Path(self.temp_dir) / "spark_header_values"
+        fwf_dir.mkdir()
+        for i in range(3):
+            generate_fwf_file(fwf_spec, 500 + i, fwf_dir / f"part{i}.fwf", lambda col: col.name.ljust(col.length))
+
+        # Small partitions split every file into several blocks.
+        self.spark.conf.set("spark.sql.files.maxPartitionBytes", "4096")
+        try:
+            rows = read_fwf(self.spark, fwf_spec, fwf_dir).collect()
+        finally:
+            self.spark.conf.unset("spark.sql.files.maxPartitionBytes")
+        self.assertEqual([tuple(row) for row in rows], [("id", "name", "amount", "day", "city")] * 1503)
+
+    def test_convert_fwf_file_spark(self):
+        from data_processor.spark_reader import convert_fwf_file_spark
+
+        fwf_spec, csv_spec = self._load_specs()
+        fwf_file = pathlib.Path(self.temp_dir) / "spark_convert.fwf"
+        generate_fwf_file(fwf_spec, 100, fwf_file, seed=2)
+        expected = [list(row) for row in parse_fwf_file(fwf_spec, fwf_file, columns=["name", "day"])]
+
+        csv_spec = select_csv_columns(fwf_spec, csv_spec, ["name", "day"])
+        csv_dir = pathlib.Path(self.temp_dir) / "spark_csv"
+        convert_fwf_file_spark(self.spark, fwf_spec, csv_spec, fwf_file, csv_dir, columns=["name", "day"])
+        rows = []
+        for part in sorted(csv_dir.glob("part-*.csv")):
+            with open(part, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                self.assertEqual(next(reader), ["name", "day"])
+                rows.extend(reader)
+        self.assertEqual(rows, expected)
+
+        parquet_dir = pathlib.Path(self.temp_dir) / "spark_parquet"
+        convert_fwf_file_spark(self.spark, fwf_spec, csv_spec, fwf_file, parquet_dir, "parquet", ["name", "day"])
+        rows = self.spark.read.parquet(str(parquet_dir)).collect()
+        self.assertEqual(sorted(tuple(row) for row in rows),
+                         sorted(tuple(row) for row in parse_fwf_file(fwf_spec, fwf_file, typed=True,
+                                                                     columns=["name", "day"])))
+        self.assertIsInstance(rows[0]["day"], datetime.date)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import tempfile
+import pathlib
+import json
+import sys
+import os
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_processor.data_processor import (
+    load_fwf_spec_file, load_csv_spec_file, generate_fwf_file, parse_fwf_file, parse_fwf_batches,
+    write_csv_file, write_batches, batches_to_rows, rows_to_batches
+)
+
+class TestWriters(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spec_data = {
+            "ColumnNames": ["id", "name", "amount", "day"],
+            "Offsets": [6, 12, 9, 10],
+            "DataTypes": ["int", "str", "decimal", "date"],
+            "Formats": [None, None, ".2f", None],
+            "FixedWidthEncoding": "utf-8",
+            "IncludeHeader": True,
+            "DelimitedEncoding": "utf-8"
+        }
+        self.spec_file = pathlib.Path(self.temp_dir) / "writers_spec.json"
+        with open(self.spec_file, "w") as f:
+            json.dump(self.spec_data, f)
+        self.fwf_spec = load_fwf_spec_file(self.spec_file)
+        self.csv_spec = load_csv_spec_file(self.spec_file)
+        self.fwf_file = pathlib.Path(self.temp_dir) / "writers.fwf"
+        generate_fwf_file(self.fwf_spec, 250, self.fwf_file)
+
+    def test_parse_fwf_batches(self):
+        batches = list(parse_fwf_batches(self.fwf_spec, self.fwf_file, batch_size=100))
+        self.assertEqual([len(columns[0]) for columns in batches], [100, 100, 50])
+        self.assertTrue(all(len(columns) == 4 for columns in batches))
+
+        rows = [row for columns in batches for row in zip(*columns)]
+        self.assertEqual([list(row) for row in rows],
+                         [list(line) for line in parse_fwf_file(self.fwf_spec, self.fwf_file)])
+
+    def test_engine_batches_match(self):
+        for batch_size in (1, 7, 100, 1000):
+            with self.subTest(batch_size=batch_size):
+                text_batches = list(parse_fwf_batches(self.fwf_spec, self.fwf_file, "text", batch_size=batch_size))
+                mmap_batches = list(parse_fwf_batches(self.fwf_spec, self.fwf_file, "mmap", batch_size=batch_size))
+                self.assertEqual(list(batches_to_rows(mmap_batches)), list(batches_to_rows(text_batches)))
+                self.assertTrue(all(len(columns[0]) <= batch_size for columns in text_batches))
+
+    def test_row_batch_adapters(self):
+        rows = [("a", 1), ("b", 2), ("c", 3)]
+        batches = list(rows_to_batches(rows, 2))
+        self.assertEqual(batches, [[("a", "b"), (1, 2)], [("c",), (3,)]])
+        self.assertEqual(list(batches_to_rows(batches)), rows)
+
+    def test_csv_sink_matches_write_csv_file(self):
+        expected_file = pathlib.Path(self.temp_dir) / "expected.csv"
+        csv_file = pathlib.Path(self.temp_dir) / "batches.csv"
+        write_csv_file(self.csv_spec, parse_fwf_file(self.fwf_spec, self.fwf_file), expected_file)
+        write_batches("csv", self.csv_spec, parse_fwf_batches(self.fwf_spec, self.fwf_file, batch_size=64), csv_file)
+
+        self.assertEqual(csv_file.read_bytes(), expected_file.read_bytes())
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_batches("xml", self.csv_spec, iter([]), pathlib.Path(self.temp_dir) / "out.xml")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet_sink_row_groups(self):
+        import pyarrow.parquet as pq
+
+        parquet_file = pathlib.Path(self.temp_dir) / "out.parquet"
+        batches = parse_fwf_batches(self.fwf_spec, self.fwf_file, typed=True, batch_size=100)
+        write_batches("parquet", self.csv_spec, batches, parquet_file, row_group_size=100)
+
+        metadata = pq.ParquetFile(parquet_file).metadata
+        self.assertEqual(metadata.num_rows, 250)
+        self.assertEqual(metadata.num_row_groups, 3)
+
+        table = pq.read_table(parquet_file)
+        expected = list(parse_fwf_file(self.fwf_spec, self.fwf_file, typed=True))
+        self.assertEqual(table.column_names, ["id", "name", "amount", "day"])
+        self.assertEqual(table.column("id").to_pylist(), [row[0] for row in expected])
+        self.assertEqual(table.column("amount").to_pylist(), [row[2] for row in expected])
+        self.assertEqual(table.column("day").to_pylist(), [row[3] for row in expected])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_sink(self):
+        import pyarrow.feather as feather
+
+        arrow_file = pathlib.Path(self.temp_dir) / "out.arrow"
+        batches = parse_fwf_batches(self.fwf_spec, self.fwf_file, typed=True, batch_size=100,
+                                    columns=["name", "id"])
+        csv_spec = load_csv_spec_file(self.spec_file)
+        csv_spec.column_names = ["name", "id"]
+        write_batches("arrow", csv_spec, batches, arrow_file)
+
+        table = feather.read_table(arrow_file)
+        expected = list(parse_fwf_file(self.fwf_spec, self.fwf_file, columns=["name", "id"], typed=True))
+        self.assertEqual(table.num_rows, 250)
+        self.assertEqual(table.column("name").to_pylist(), [row[0] for row in expected])
+        self.assertEqual(table.column("id").to_pylist(), [row[1] for row in expected])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_schema_from_declared_types(self):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        rows = [("", "a", "1.5", "2024-01-31"), ("", "b", "2.5", ""),
+                ("7", "c", "1.25", "2024-02-01"), ("8", "d", "", "2024-02-02")]
+        values = iter(value for row in rows for value in row)
+        fwf_file = pathlib.Path(self.temp_dir) / "schema.fwf"
+        generate_fwf_file(self.fwf_spec, len(rows), fwf_file, lambda col: next(values).ljust(col.length))
+        expected = list(parse_fwf_file(self.fwf_spec, fwf_file, typed=True))
+        schema = pa.schema([("id", pa.int64()), ("name", pa.string()),
+                            ("amount", pa.decimal128(38, 2)), ("day", pa.date32())])
+
+        for output_format, read_table in (("parquet", pq.read_table), ("arrow", feather.read_table)):
+            with self.subTest(output_format=output_format):
+                output_file = pathlib.Path(self.temp_dir) / f"schema.{output_format}"
+                batches = parse_fwf_batches(self.fwf_spec, fwf_file, typed=True, batch_size=2)
+                write_batches(output_format, self.csv_spec, batches, output_file, fwf_spec=self.fwf_spec)
+
+                table = read_table(output_file)
+                self.assertEqual(table.schema, schema)
+                self.assertEqual([tuple(row.values()) for row in table.to_pylist()], expected)
+
+if __name__ == '__main__':
+    unittest.main()